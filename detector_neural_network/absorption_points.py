@@ -0,0 +1,239 @@
+from typing import NamedTuple
+
+import numpy as np
+from pandas import DataFrame
+
+# Коды статуса точки поглощения (колонка status, int8)
+STATUS_UNVERIFIED = -1  # Не проверена оператором (None)
+STATUS_REJECTED = 0  # Отклонена (False)
+STATUS_CONFIRMED = 1  # Подтверждена (True)
+
+# Колонки точек поглощения и их типы
+COLUMNS = {
+    "frequency": np.float64,
+    "gamma": np.float64,
+    "status": np.int8,
+    "source_neural_network": np.bool_,
+    "margin": np.float64,
+}
+# Начальная емкость буферов (при заполнении емкость удваивается)
+INITIAL_CAPACITY = 64
+
+# Виды изменения точек поглощения (AbsorptionChange.kind)
+CHANGE_RESET = "reset"  # Точки заменены или изменены произвольно - перестроение отображения
+CHANGE_STATUS = "status"  # Изменен статус точек indices
+CHANGE_INSERT = "insert"  # Вставлена точка с индексом indices[0] (индексы следующих точек увеличились на 1)
+CHANGE_DELETE = "delete"  # Удалены точки indices по очереди (индексы следующих точек уменьшились)
+
+
+class AbsorptionChange(NamedTuple):
+    """
+    Описание изменения точек поглощения, передаваемое перехватчику absorption_interceptor (аргумент change).
+
+    Позволяет таблице и графику обновить только затронутые строки и точки.
+    """
+
+    kind: str
+    indices: tuple[int, ...] = ()
+
+
+# Изменение без описания - отображение перестраивается целиком
+ABSORPTION_RESET = AbsorptionChange(CHANGE_RESET)
+
+
+def status_to_code(status: bool | None) -> int:
+    """Код статуса по значению True/False/None."""
+    if status is None:
+        return STATUS_UNVERIFIED
+    return STATUS_CONFIRMED if status else STATUS_REJECTED
+
+
+def code_to_status(code: int) -> bool | None:
+    """Значение True/False/None по коду статуса."""
+    return None if code == STATUS_UNVERIFIED else bool(code == STATUS_CONFIRMED)
+
+
+class AbsorptionPointStore:
+    """
+    Точки поглощения, отсортированные по частоте.
+
+    Колонки хранятся массивами numpy в буферах с запасом емкости: частота и гамма (float64), статус (int8, коды
+    STATUS_*), источник - нейронная сеть (bool) и запас над спектром без вещества (float64, NaN - не вычислялся).
+    Поиск точки по координатам - бинарный поиск по частоте за O(log n). Вставка и удаление - бинарный поиск и сдвиг
+    хвоста буфера: копирование O(n) без перестроения таблицы и сортировки (при 100 тыс. точек - около 0.1 мс).
+    Структура с вставкой за O(log n) (блоки, дерево) не используется: таблица, график и файл результата читают
+    колонки непрерывными массивами, и сборка массивов при каждом чтении стоила бы не меньше сдвига.
+    Индекс точки - ее позиция в порядке частот.
+    Массивы колонок - представления буферов, действительные до следующего изменения хранилища.
+    """
+
+    __slots__ = ("__columns", "__size")
+
+    def __init__(self, capacity: int = INITIAL_CAPACITY):
+        self.__columns: dict[str, np.ndarray] = {
+            name: np.empty(max(capacity, 1), dtype=dtype) for name, dtype in COLUMNS.items()
+        }
+        self.__size: int = 0
+
+    @classmethod
+    def from_arrays(
+        cls,
+        frequency,
+        gamma,
+        status=None,
+        source_neural_network=None,
+        margin=None,
+    ) -> "AbsorptionPointStore":
+        """
+        Хранилище из массивов колонок (сортируется по частоте, порядок равных частот сохраняется).
+
+        :param status: Коды статуса или значения True/False/None (None - все не проверены).
+        :param source_neural_network: Источник точек (None - все найдены нейронной сетью).
+        :param margin: Запас над спектром без вещества (None - NaN).
+        """
+        store = cls(len(frequency))
+        store.merge(frequency, gamma, status, source_neural_network, margin)
+        return store
+
+    # ---------------------------------------------------------------------------
+    #   Доступ к данным
+    # ---------------------------------------------------------------------------
+    def __len__(self) -> int:
+        return self.__size
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        """Массив колонки по имени."""
+        return self.__columns[column][: self.__size]
+
+    @property
+    def empty(self) -> bool:
+        return self.__size == 0
+
+    @property
+    def frequency(self) -> np.ndarray:
+        return self["frequency"]
+
+    @property
+    def gamma(self) -> np.ndarray:
+        return self["gamma"]
+
+    @property
+    def status(self) -> np.ndarray:
+        return self["status"]
+
+    @property
+    def source_neural_network(self) -> np.ndarray:
+        return self["source_neural_network"]
+
+    @property
+    def margin(self) -> np.ndarray:
+        return self["margin"]
+
+    def get_status(self, index: int) -> bool | None:
+        return code_to_status(self.__columns["status"][index])
+
+    def statuses(self) -> list[bool | None]:
+        """Статусы точек значениями True/False/None."""
+        return [code_to_status(code) for code in self.status.tolist()]
+
+    def indices_of(self, frequency: float, gamma: float) -> np.ndarray:
+        """Индексы точек с заданными координатами (бинарный поиск по частоте)."""
+        left = int(np.searchsorted(self.frequency, frequency, side="left"))
+        right = int(np.searchsorted(self.frequency, frequency, side="right"))
+        return left + np.flatnonzero(self.gamma[left:right] == gamma)
+
+    def insertion_index(self, frequency: float) -> int:
+        """Индекс, который получит точка с частотой frequency при вставке (после точек с той же частотой)."""
+        return int(np.searchsorted(self.frequency, frequency, side="right"))
+
+    def find(self, frequency: float, gamma: float) -> int | None:
+        """Индекс первой точки с заданными координатами или None."""
+        indices = self.indices_of(frequency, gamma)
+        return int(indices[0]) if len(indices) else None
+
+    # ---------------------------------------------------------------------------
+    #   Изменение данных
+    # ---------------------------------------------------------------------------
+    def set_status(self, index, status: bool | None) -> None:
+        """Статус точки (или точек по массиву индексов)."""
+        self.__columns["status"][: self.__size][index] = status_to_code(status)
+
+    def insert(
+        self,
+        frequency: float,
+        gamma: float,
+        status: bool | None = True,
+        source_neural_network: bool = False,
+        margin: float = np.nan,
+    ) -> int:
+        """
+        Вставляет точку с сохранением порядка частот (после точек с той же частотой). Возвращает ее индекс.
+
+        Позиция - бинарный поиск, затем сдвиг хвоста колонок на одну позицию (O(n)).
+        """
+        index = self.insertion_index(frequency)
+        self.__reserve(self.__size + 1)
+        values = (frequency, gamma, status_to_code(status), source_neural_network, margin)
+        for column, value in zip(self.__columns.values(), values):
+            column[index + 1 : self.__size + 1] = column[index : self.__size]
+            column[index] = value
+        self.__size += 1
+        return index
+
+    def delete(self, index: int) -> None:
+        """Удаляет точку по индексу (сдвиг хвоста колонок, O(n))."""
+        if not 0 <= index < self.__size:
+            raise IndexError(index)
+        for column in self.__columns.values():
+            column[index : self.__size - 1] = column[index + 1 : self.__size]
+        self.__size -= 1
+
+    def merge(self, frequency, gamma, status=None, source_neural_network=None, margin=None) -> None:
+        """Добавляет набор точек (параметры как у from_arrays) одним слиянием с сортировкой."""
+        count = len(frequency)
+        if len(gamma) != count:
+            raise ValueError("Количество частот не совпадает с количеством значений гамма")
+        if status is None:
+            status = np.full(count, STATUS_UNVERIFIED, dtype=np.int8)
+        elif not isinstance(status, np.ndarray) or status.dtype != np.int8:
+            status = np.fromiter((status_to_code(value) for value in status), dtype=np.int8, count=count)
+        new_columns = {
+            "frequency": frequency,
+            "gamma": gamma,
+            "status": status,
+            "source_neural_network": True if source_neural_network is None else source_neural_network,
+            "margin": np.nan if margin is None else margin,
+        }
+        merged = {
+            name: np.concatenate([self[name], np.broadcast_to(np.asarray(new_columns[name], dtype=dtype), (count,))])
+            for name, dtype in COLUMNS.items()
+        }
+        order = np.argsort(merged["frequency"], kind="stable")
+        self.__columns = {name: column[order] for name, column in merged.items()}
+        self.__size = len(order)
+
+    def clear(self) -> None:
+        self.__size = 0
+
+    def __reserve(self, size: int) -> None:
+        """Увеличивает емкость буферов (удвоением) до размера не меньше size."""
+        capacity = len(self.__columns["frequency"])
+        if size <= capacity:
+            return
+        capacity = max(size, capacity * 2)
+        for name, column in self.__columns.items():
+            buffer = np.empty(capacity, dtype=column.dtype)
+            buffer[: self.__size] = column[: self.__size]
+            self.__columns[name] = buffer
+
+    def to_dataframe(self) -> DataFrame:
+        """Таблица точек поглощения (status - True/False/None) - копия данных."""
+        return DataFrame(
+            {
+                "frequency": self.frequency.copy(),
+                "gamma": self.gamma.copy(),
+                "status": np.array(self.statuses(), dtype=object),
+                "source_neural_network": self.source_neural_network.copy(),
+                "margin": self.margin.copy(),
+            }
+        )
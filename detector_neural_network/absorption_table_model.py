@@ -0,0 +1,220 @@
+from pyqtgraph.Qt.QtCore import QAbstractTableModel, QEvent, QModelIndex, QSize, QSortFilterProxyModel, Qt, Signal
+from pyqtgraph.Qt.QtWidgets import QStyledItemDelegate
+
+from detector_neural_network.absorption_points import (
+    CHANGE_DELETE,
+    CHANGE_INSERT,
+    CHANGE_RESET,
+    CHANGE_STATUS,
+    STATUS_CONFIRMED,
+    STATUS_REJECTED,
+    STATUS_UNVERIFIED,
+    AbsorptionChange,
+    AbsorptionPointStore,
+)
+from detector_neural_network.data_and_processing import DataAndProcessing
+from detector_neural_network.multi_check_box import (
+    ICON_PATH_NO,
+    ICON_PATH_UNDEFINED,
+    ICON_PATH_YES_BLUE,
+    ICON_PATH_YES_GREEN,
+    get_svg_icon,
+)
+
+# Колонки таблицы
+COLUMN_FREQUENCY = 0
+COLUMN_GAMMA = 1
+COLUMN_STATUS = 2
+HEADERS = ("Частота МГц", "Гамма", "")
+# Роли данных колонки статуса: код статуса (STATUS_*) и источник точки (True - нейронная сеть)
+STATUS_ROLE = Qt.ItemDataRole.UserRole
+SOURCE_ROLE = Qt.ItemDataRole.UserRole + 1
+
+# Режимы отображения (индексы comboBox_select_table_view)
+FILTER_ALL = 0
+FILTER_UNVERIFIED = 1
+FILTER_REJECTED = 2
+FILTER_CONFIRMED = 3
+FILTER_MANUAL = 4
+
+
+class AbsorptionTableModel(QAbstractTableModel):
+    """
+    Модель таблицы точек поглощения над хранилищем DataAndProcessing.
+
+    Строка модели - индекс точки в хранилище. Данные не копируются: ячейки читаются из массивов хранилища при
+    отрисовке, поэтому стоимость отображения зависит только от числа видимых строк.
+    Изменения точек сообщаются модели дважды: about_to_change до изменения хранилища (перехватчик
+    set_absorption_pre_interceptor) и apply_change после него (перехватчик set_absorption_interceptor).
+    """
+
+    def __init__(self, data: DataAndProcessing, parent=None):
+        super().__init__(parent)
+        self.__data = data
+        # Начатое в about_to_change изменение строк (CHANGE_*), которое завершает apply_change
+        self.__pending: str | None = None
+
+    def points(self) -> AbsorptionPointStore:
+        return self.__data.get_point_absorption()
+
+    # parent=None - корень таблицы (QModelIndex())
+    def rowCount(self, parent: QModelIndex | None = None) -> int:
+        return 0 if parent is not None and parent.isValid() else len(self.points())
+
+    def columnCount(self, parent: QModelIndex | None = None) -> int:
+        return 0 if parent is not None and parent.isValid() else len(HEADERS)
+
+    def data(self, index: QModelIndex, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        points = self.points()
+        row, column = index.row(), index.column()
+        if role == Qt.ItemDataRole.DisplayRole:
+            if column == COLUMN_FREQUENCY:
+                return f"{points.frequency[row]:.3f}"
+            if column == COLUMN_GAMMA:
+                return f"{points.gamma[row]:.7E}"
+        elif role == STATUS_ROLE:
+            return int(points.status[row])
+        elif role == SOURCE_ROLE:
+            return bool(points.source_neural_network[row])
+        return None
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def about_to_change(self, change: AbsorptionChange):
+        """
+        Сообщает представлениям о предстоящем изменении точек поглощения (вызывается до изменения хранилища).
+
+        Вставка точки и удаление точек, идущих подряд, начинают вставку и удаление строк, остальные изменения
+        (кроме смены статуса, не меняющей строк) - сброс модели. Изменение завершает apply_change.
+        """
+        if change.kind == CHANGE_STATUS or (change.kind == CHANGE_DELETE and not change.indices):
+            return
+        first, last = (min(change.indices), max(change.indices)) if change.indices else (0, -1)
+        if change.kind == CHANGE_INSERT and len(change.indices) == 1:
+            self.beginInsertRows(QModelIndex(), first, last)
+            self.__pending = CHANGE_INSERT
+        elif change.kind == CHANGE_DELETE and last - first + 1 == len(change.indices):
+            self.beginRemoveRows(QModelIndex(), first, last)
+            self.__pending = CHANGE_DELETE
+        else:
+            self.beginResetModel()
+            self.__pending = CHANGE_RESET
+
+    def apply_change(self, change: AbsorptionChange):
+        """
+        Сообщает представлениям об изменении точек поглощения (перехватчик вызывается после изменения хранилища).
+
+        Завершает изменение, начатое about_to_change. Смена статуса обновляет строки затронутых точек.
+        Изменение без about_to_change (например, после замены точек при очистке данных) сбрасывает модель.
+        """
+        pending, self.__pending = self.__pending, None
+        if pending == CHANGE_INSERT:
+            self.endInsertRows()
+        elif pending == CHANGE_DELETE:
+            self.endRemoveRows()
+        elif pending == CHANGE_RESET:
+            self.endResetModel()
+        elif change.kind == CHANGE_STATUS:
+            for row in change.indices:
+                self.dataChanged.emit(self.index(row, 0), self.index(row, len(HEADERS) - 1))
+        elif change.kind != CHANGE_DELETE or change.indices:
+            self.beginResetModel()
+            self.endResetModel()
+
+
+class AbsorptionFilterProxyModel(QSortFilterProxyModel):
+    """Фильтр строк таблицы точек поглощения по режиму отображения (FILTER_*)."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.__mode = FILTER_ALL
+        # Статус строки может измениться в любой колонке - фильтр пересчитывается при любом изменении строки
+        self.setFilterKeyColumn(-1)
+
+    def set_filter_mode(self, mode: int):
+        # Изменение фильтра обрамляется begin/endFilterChange: строки пересчитываются после смены режима
+        self.beginFilterChange()
+        self.__mode = mode
+        self.endFilterChange(QSortFilterProxyModel.Direction.Rows)
+
+    def filterAcceptsRow(self, source_row: int, source_parent: QModelIndex) -> bool:
+        if self.__mode == FILTER_ALL:
+            return True
+        # Значения - скаляры Python: виртуальный метод C++ должен вернуть bool, а не numpy.bool_
+        points = self.sourceModel().points()
+        status = int(points.status[source_row])
+        source = bool(points.source_neural_network[source_row])
+        if self.__mode == FILTER_UNVERIFIED:
+            return status == STATUS_UNVERIFIED
+        if self.__mode == FILTER_REJECTED:
+            return status == STATUS_REJECTED
+        if self.__mode == FILTER_CONFIRMED:
+            return status == STATUS_CONFIRMED and source
+        if self.__mode == FILTER_MANUAL:
+            return status == STATUS_CONFIRMED and not source
+        return False
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role=Qt.ItemDataRole.DisplayRole):
+        # Номера строк - по порядку отображения, а не индексы точек
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Vertical:
+            return section + 1
+        return super().headerData(section, orientation, role)
+
+
+class AbsorptionStatusDelegate(QStyledItemDelegate):
+    """
+    Отрисовка статуса точки поглощения иконкой мульти-чекбокса без создания виджетов в ячейках.
+
+    Нажатие на ячейку статуса испускает clicked с индексом ячейки (изменение статуса выполняет владелец таблицы).
+    """
+
+    clicked = Signal(QModelIndex)
+
+    def __init__(self, icon_size: int = 22, parent=None):
+        super().__init__(parent)
+        self.icon_size = icon_size
+        # Иконки по источнику точки (True - нейронная сеть) и коду статуса
+        self.icon_paths = {
+            (True, STATUS_REJECTED): ICON_PATH_NO,
+            (True, STATUS_UNVERIFIED): ICON_PATH_UNDEFINED,
+            (True, STATUS_CONFIRMED): ICON_PATH_YES_GREEN,
+            (False, STATUS_REJECTED): ICON_PATH_NO,
+            (False, STATUS_UNVERIFIED): ICON_PATH_UNDEFINED,
+            (False, STATUS_CONFIRMED): ICON_PATH_YES_BLUE,
+        }
+
+    def paint(self, painter, option, index: QModelIndex):
+        # Фон и выделение строки - стандартные
+        super().paint(painter, option, index)
+        status = index.data(STATUS_ROLE)
+        if status is None:
+            return
+        # Иконка из общего кэша с плотностью пикселей устройства отрисовки
+        icon = get_svg_icon(
+            self.icon_paths[(bool(index.data(SOURCE_ROLE)), status)],
+            self.icon_size,
+            painter.device().devicePixelRatioF(),
+        )
+        rect = option.rect
+        painter.drawPixmap(
+            rect.x() + (rect.width() - self.icon_size) // 2, rect.y() + (rect.height() - self.icon_size) // 2, icon
+        )
+
+    def sizeHint(self, option, index: QModelIndex) -> QSize:
+        return QSize(self.icon_size + 8, self.icon_size + 4)
+
+    def editorEvent(self, event, model, option, index: QModelIndex) -> bool:
+        # Нажатие (и двойное нажатие, как у мульти-чекбокса) левой кнопкой по ячейке статуса
+        if (
+            event.type() in (QEvent.Type.MouseButtonPress, QEvent.Type.MouseButtonDblClick)
+            and event.button() == Qt.MouseButton.LeftButton
+            and option.rect.contains(event.position().toPoint())
+        ):
+            self.clicked.emit(index)
+            return True
+        return False
@@ -0,0 +1,68 @@
+import threading
+from collections.abc import Callable
+
+from pyqtgraph.Qt.QtCore import QObject, QRunnable, Signal
+
+
+class TaskCancelled(Exception):
+    """Задача прервана пользователем."""
+
+
+class TaskSignals(QObject):
+    """
+    Сигналы фоновой задачи.
+
+    Объект создается в потоке интерфейса, поэтому сигналы, отправленные из потока пула, доставляются в поток
+    интерфейса через очередь событий.
+    """
+
+    progress = Signal(int, int)  # Выполнено, всего (0 - объем неизвестен)
+    finished = Signal(object)  # Результат функции задачи
+    failed = Signal(object)  # Исключение
+    cancelled = Signal()
+
+
+class BackgroundTask(QRunnable):
+    """
+    Задача для QThreadPool: выполняет функцию вне потока интерфейса и возвращает результат сигналом.
+
+    Функция получает задачу аргументом и сообщает прогресс через report_progress, который также является точкой
+    отмены: после cancel() очередной вызов прерывает функцию исключением TaskCancelled.
+    Функция не должна изменять данные, отображаемые интерфейсом, - результат применяется в обработчике finished.
+    """
+
+    def __init__(self, function: Callable[["BackgroundTask"], object]):
+        super().__init__()
+        # Объект задачи принадлежит вызывающему коду, пул не должен удалять его после выполнения
+        self.setAutoDelete(False)
+        self.function = function
+        self.signals = TaskSignals()
+        self.__cancel_requested = threading.Event()
+
+    def cancel(self) -> None:
+        """Запрос отмены (выполняется в точке отмены report_progress)."""
+        self.__cancel_requested.set()
+
+    def is_cancelled(self) -> bool:
+        return self.__cancel_requested.is_set()
+
+    def report_progress(self, done: int, total: int = 0) -> None:
+        """Сообщает прогресс, прерывает задачу при запрошенной отмене."""
+        if self.is_cancelled():
+            raise TaskCancelled()
+        self.signals.progress.emit(done, total)
+
+    def run(self) -> None:
+        try:
+            result = self.function(self)
+        except TaskCancelled:
+            self.signals.cancelled.emit()
+            return
+        except Exception as error:  # noqa: BLE001 - любая ошибка задачи передается в поток интерфейса сигналом failed
+            self.signals.failed.emit(error)
+            return
+        # Результат задачи, отмененной после последней точки отмены, не применяется
+        if self.is_cancelled():
+            self.signals.cancelled.emit()
+        else:
+            self.signals.finished.emit(result)
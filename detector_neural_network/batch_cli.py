@@ -0,0 +1,102 @@
+"""
+Пакетная обработка спектров из командной строки (без графического интерфейса).
+
+Модуль не импортирует PySide6 и может запускаться на серверах без графической подсистемы.
+"""
+
+import argparse
+import glob
+import os
+import sys
+
+from detector_neural_network import setting
+from detector_neural_network.batch_runner import BatchInputError, run_batch
+
+# Шаблон файлов спектрометра при указании директории
+SPECTRUM_FILE_PATTERN = "*.csv"
+
+
+def find_spectrum_files(inputs: list[str]) -> list[str]:
+    """
+    Список файлов с веществом по путям к файлам, директориям (все *.csv) и шаблонам glob.
+
+    Порядок - как в аргументах, внутри директории или шаблона - по имени, без повторов.
+    """
+    file_names = []
+    for path in inputs:
+        pattern = os.path.join(path, SPECTRUM_FILE_PATTERN) if os.path.isdir(path) else path
+        for file_name in sorted(glob.glob(pattern)):
+            if os.path.isfile(file_name) and file_name not in file_names:
+                file_names.append(file_name)
+    return file_names
+
+
+def create_argument_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="run-detector-batch",
+        description="Поиск линий поглощения нейронной сетью в наборе файлов спектрометра без графического интерфейса.",
+    )
+    parser.add_argument("inputs", nargs="+", help="Файлы с веществом, директории (все *.csv) или шаблоны glob.")
+    parser.add_argument(
+        "-m",
+        "--model",
+        default=setting.DEFAULT_FILE_PATH_NEURAL_NETWORK,
+        help="Файл нейронной сети (*.joblib). По умолчанию - модель из поставки.",
+    )
+    parser.add_argument("-b", "--baseline", help="Файл спектра без вещества.")
+    parser.add_argument("-o", "--output-dir", help="Директория результатов. По умолчанию - рядом с файлами спектров.")
+    parser.add_argument(
+        "-r",
+        "--range",
+        nargs=2,
+        type=float,
+        metavar=("START", "END"),
+        help="Обрабатывать только заданный диапазон частот.",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Количество параллельных процессов (0 - по числу ядер). По умолчанию - 1.",
+    )
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Точка входа run-detector-batch. Возвращает 0, если все файлы обработаны, иначе 1."""
+    args = create_argument_parser().parse_args(argv)
+    start_frequency, end_frequency = args.range if args.range else (None, None)
+
+    file_names = find_spectrum_files(args.inputs)
+    if not file_names:
+        print("Не найдено файлов для обработки", file=sys.stderr)
+        return 1
+    if args.output_dir is not None:
+        os.makedirs(args.output_dir, exist_ok=True)
+
+    # Файлы обрабатываются в пуле процессов, результаты - по мере завершения
+    failed = 0
+    results = run_batch(
+        file_names, args.model, args.baseline, args.output_dir, start_frequency, end_frequency, args.jobs
+    )
+    # Ошибка модели или спектра без вещества (BatchInputError) возникает до обработки первого файла
+    try:
+        for number, result in enumerate(results, start=1):
+            # Ошибка в одном файле не останавливает обработку набора
+            if result.error is not None:
+                failed += 1
+                print(f"[{number}/{len(file_names)}] {result.file_name}: ошибка: {result.error}", file=sys.stderr)
+                continue
+            print(
+                f"[{number}/{len(file_names)}] {result.file_name} -> {result.result_file_name} ({result.count} точек)"
+            )
+    except BatchInputError as error:
+        print(error, file=sys.stderr)
+        return 1
+    print(f"Обработано: {len(file_names) - failed}, ошибок: {failed}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
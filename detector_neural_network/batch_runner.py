@@ -0,0 +1,197 @@
+import os
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import NamedTuple
+
+import numpy as np
+from joblib import load
+from sklearn.neural_network import MLPClassifier
+
+from detector_neural_network.data_and_processing import DataAndProcessing, prepare_spectrum_without_substance
+from detector_neural_network.result_file import get_result_file_name, write_result_file
+from detector_neural_network.spectrum_reader import SpectrumFile, iter_spectrum_chunks
+
+# Данные процесса-исполнителя: модель загружается один раз при запуске процесса, спектр без вещества
+# подготавливается один раз в основном процессе
+_worker_data: DataAndProcessing | None = None
+_worker_baseline: tuple[np.ndarray, np.ndarray] | None = None
+
+
+class BatchInputError(Exception):
+    """Ошибка общих для всего набора данных (нейронная сеть, спектр без вещества) - набор не запускается."""
+
+
+class BatchResult(NamedTuple):
+    """Результат обработки одного файла набора."""
+
+    file_name: str
+    result_file_name: str | None
+    count: int
+    error: str | None = None
+
+
+def read_spectrum_data(
+    file_name: str, start_frequency: float | None = None, end_frequency: float | None = None
+) -> tuple[np.ndarray, np.ndarray]:
+    """Читает спектр (при указании границ - только в заданном диапазоне частот)."""
+    frequency, gamma = SpectrumFile(file_name).get_data(start_frequency, end_frequency)
+    if len(frequency) == 0:
+        raise ValueError(f"Нет данных в файле {file_name}")
+    return frequency, gamma
+
+
+def read_spectrum_chunks(
+    file_name: str, start_frequency: float | None = None, end_frequency: float | None = None
+) -> Iterator[tuple[np.ndarray, np.ndarray]]:
+    """
+    Потоковое чтение спектра порциями (при указании границ - только в заданном диапазоне частот).
+
+    Файл целиком в память не загружается: порции передаются в DataAndProcessing.set_spectrum_with_substance_chunks.
+    """
+    start_frequency = -np.inf if start_frequency is None else start_frequency
+    end_frequency = np.inf if end_frequency is None else end_frequency
+    empty = True
+    for frequency, gamma in iter_spectrum_chunks(file_name):
+        in_range = (start_frequency <= frequency) & (frequency <= end_frequency)
+        if in_range.any():
+            empty = False
+            yield frequency[in_range], gamma[in_range]
+    if empty:
+        raise ValueError(f"Нет данных в файле {file_name}")
+
+
+def process_file(
+    data: DataAndProcessing,
+    file_name: str,
+    baseline: tuple[np.ndarray, np.ndarray] | None,
+    output_dir: str | None = None,
+    start_frequency: float | None = None,
+    end_frequency: float | None = None,
+    workers: int | None = None,
+) -> tuple[str, int]:
+    """
+    Обработка одного файла с веществом и запись файла результата 'Result_for_<имя>.txt'.
+
+    Спектр с веществом читается и подготавливается потоково, память при чтении не зависит от длины записи.
+
+    :param data: Данные с загруженной нейронной сетью (спектры перезаписываются).
+    :param file_name: Путь к файлу с веществом.
+    :param baseline: Спектр без вещества, подготовленный prepare_spectrum_without_substance (None - без проверки
+        разницы с ним).
+    :param output_dir: Директория результатов (None - рядом с файлом спектра).
+    :param workers: Количество исполнителей предсказания внутри файла (None - setting.INFERENCE_WORKERS).
+    :return: Путь к файлу результата и количество записанных точек поглощения.
+    """
+    data.clear_data()
+    data.set_spectrum_with_substance_chunks(read_spectrum_chunks(file_name, start_frequency, end_frequency))
+    if baseline is not None:
+        data.apply_spectrum_without_substance(*baseline)
+    data.processing(workers=workers)
+    result_file_name = get_result_file_name(
+        file_name, os.path.dirname(file_name) if output_dir is None else output_dir, ".txt"
+    )
+    # Оператора нет - непроверенные точки нейронной сети записываются вместе с подтвержденными
+    return result_file_name, write_result_file(result_file_name, data.get_point_absorption(), include_unverified=True)
+
+
+def describe_error(error: BaseException) -> str:
+    return f"{type(error).__name__}: {error}"
+
+
+def load_neural_network(model_file: str) -> MLPClassifier:
+    """Загрузка и проверка нейронной сети в основном процессе, до запуска пула."""
+    try:
+        neural_network = load(model_file)
+        DataAndProcessing().set_neural_network(neural_network)
+    except Exception as error:
+        raise BatchInputError(f"Не удалось загрузить нейронную сеть {model_file}: {describe_error(error)}") from error
+    return neural_network
+
+
+def load_baseline(
+    baseline_file: str, start_frequency: float | None = None, end_frequency: float | None = None
+) -> tuple[np.ndarray, np.ndarray]:
+    """Чтение и подготовка спектра без вещества в основном процессе, один раз на набор."""
+    try:
+        return prepare_spectrum_without_substance(*read_spectrum_data(baseline_file, start_frequency, end_frequency))
+    except Exception as error:
+        raise BatchInputError(
+            f"Не удалось загрузить спектр без вещества {baseline_file}: {describe_error(error)}"
+        ) from error
+
+
+def set_worker_data(neural_network: MLPClassifier, baseline: tuple[np.ndarray, np.ndarray] | None) -> None:
+    global _worker_data, _worker_baseline
+    _worker_data = DataAndProcessing()
+    _worker_data.set_neural_network(neural_network)
+    _worker_baseline = baseline
+
+
+def init_worker(model_file: str, baseline: tuple[np.ndarray, np.ndarray] | None = None) -> None:
+    """Инициализатор процесса пула: загрузка модели один раз на процесс (файл уже проверен load_neural_network)."""
+    set_worker_data(load(model_file), baseline)
+
+
+def run_file(
+    file_name: str,
+    output_dir: str | None = None,
+    start_frequency: float | None = None,
+    end_frequency: float | None = None,
+    workers: int | None = None,
+) -> BatchResult:
+    """Обработка файла в исполнителе. Ошибка возвращается в результате и не прерывает набор."""
+    try:
+        result_file_name, count = process_file(
+            _worker_data, file_name, _worker_baseline, output_dir, start_frequency, end_frequency, workers
+        )
+    except Exception as error:  # noqa: BLE001 - любая ошибка файла становится его результатом, набор продолжается
+        return BatchResult(file_name, None, 0, describe_error(error))
+    return BatchResult(file_name, result_file_name, count)
+
+
+def run_batch(
+    file_names: list[str],
+    model_file: str,
+    baseline_file: str | None = None,
+    output_dir: str | None = None,
+    start_frequency: float | None = None,
+    end_frequency: float | None = None,
+    jobs: int = 1,
+) -> Iterator[BatchResult]:
+    """
+    Обработка набора файлов в пуле процессов.
+
+    Модель и спектр без вещества проверяются (и спектр подготавливается) один раз в текущем процессе до запуска пула,
+    ошибка в них вызывает BatchInputError до обработки первого файла. Каждый процесс один раз загружает модель
+    (инициализатор пула) и обрабатывает файлы целиком, поэтому файлы обрабатываются независимо и производительность
+    растет почти линейно с числом ядер. Предсказание внутри файла в процессе пула выполняется последовательно, чтобы
+    не конкурировать за ядра с другими процессами. Ошибка файла или аварийное завершение процесса пула
+    возвращается результатом с ошибкой для каждого затронутого файла, набор не прерывается.
+    При jobs <= 1 файлы обрабатываются по очереди в текущем процессе.
+
+    :param jobs: Количество процессов (0 - по числу ядер).
+    :return: Итератор результатов в порядке завершения обработки файлов.
+    """
+    jobs = jobs or os.cpu_count() or 1
+    # Общие данные проверяются до запуска пула: ошибка в них остановила бы каждый процесс
+    neural_network = load_neural_network(model_file)
+    baseline = None if baseline_file is None else load_baseline(baseline_file, start_frequency, end_frequency)
+    if jobs <= 1 or len(file_names) < 2:
+        set_worker_data(neural_network, baseline)
+        for file_name in file_names:
+            yield run_file(file_name, output_dir, start_frequency, end_frequency)
+        return
+    with ProcessPoolExecutor(
+        max_workers=min(jobs, len(file_names)), initializer=init_worker, initargs=(model_file, baseline)
+    ) as pool:
+        futures = {
+            pool.submit(run_file, file_name, output_dir, start_frequency, end_frequency, 1): file_name
+            for file_name in file_names
+        }
+        for future in as_completed(futures):
+            # Аварийное завершение процесса (BrokenProcessPool) - ошибка файлов, которые он не обработал
+            try:
+                result = future.result()
+            except Exception as error:  # noqa: BLE001 - сбой пула становится ошибкой файла, набор не прерывается
+                result = BatchResult(futures[future], None, 0, describe_error(error))
+            yield result
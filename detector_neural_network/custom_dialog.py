@@ -6,6 +6,7 @@ from detector_neural_network.gui import Ui_Dialog
 from detector_neural_network.app_exception import AppException
 from detector_neural_network.color_theme.theme import color_theme
 from detector_neural_network.data_and_processing import DataAndProcessing
+from detector_neural_network.spectrum_reader import SpectrumFile
 from detector_neural_network.ui_validators import get_float_and_positive
 
 
@@ -32,10 +33,10 @@ class CustomDialog(QDialog, Ui_Dialog):
         # 3.1 Нейронная сеть
         self.file_name_neural_network: str | None = None
         # 3.2 Спектр без вещества
-        self.lines_file_without_gas: list[str] | None = None
+        self.spectrum_file_without_gas: SpectrumFile | None = None
         self.file_name_without_substance: str | None = None
         # 3.3 Спектр с веществом
-        self.lines_file_with_gas: list[str] | None = None
+        self.spectrum_file_with_gas: SpectrumFile | None = None
         self.file_name_with_substance: str | None = None
 
         # 2. Объект данных (данные со спектрометра и нейронная сеть) их обработки
@@ -63,14 +64,14 @@ class CustomDialog(QDialog, Ui_Dialog):
 
         spectra = self.data.get_spectra()
         # Проверяем наличие "Спектра без вещества" (выставляем соответсвующий статус и имя файла)
-        if not (spectra["without_gas"].empty or spectra["without_gas"].isna().all()):
+        if spectra.has_without_gas:
             self.label_text_file_name_no_gas.setText(os.path.basename(self.file_name_without_substance))
             self.checkBox_download_no_gas.setCheckState(Qt.CheckState.Checked)
         else:
             self.label_text_file_name_no_gas.setText("Нет файла")
             self.checkBox_download_no_gas.setCheckState(Qt.CheckState.Unchecked)
         # Проверяем наличие "Спектра с веществом"
-        if not (spectra["with_gas"].empty or spectra["with_gas"].isna().all()):
+        if spectra.has_with_gas:
             self.label_text_file_name_with_gas.setText(os.path.basename(self.file_name_with_substance))
             self.checkBox_download_with_gas.setCheckState(Qt.CheckState.Checked)
         else:
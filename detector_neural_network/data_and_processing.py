@@ -1,26 +1,43 @@
 import numpy as np
 from functools import wraps
-from typing import Callable, ClassVar
-from pandas import DataFrame, Series, concat
+from collections.abc import Callable, Iterable
+from typing import NamedTuple
+from pandas import DataFrame, Series
 from scipy import ndimage
-from scipy.interpolate import interp1d
-from scipy.ndimage import label, uniform_filter1d
-from scipy.signal import butter, savgol_filter, sosfilt
 from sklearn.neural_network import MLPClassifier
 from sklearn.preprocessing import StandardScaler
 
 from detector_neural_network import setting
+from detector_neural_network.absorption_points import (
+    ABSORPTION_RESET,
+    CHANGE_DELETE,
+    CHANGE_INSERT,
+    CHANGE_STATUS,
+    AbsorptionChange,
+    AbsorptionPointStore,
+)
+from detector_neural_network.inference import predict_windows_parallel
+from detector_neural_network.mlp_engine import MlpInferenceEngine
+from detector_neural_network.preprocessing import (
+    WITH_SUBSTANCE_PIPELINE,
+    WITHOUT_SUBSTANCE_PIPELINE,
+    PreparedSpectrum,
+    run_pipeline,
+)
+from detector_neural_network.resampling import GRID_STEP, resample_uniform
+from detector_neural_network.spectrum_data import SpectrumData
+from detector_neural_network.streaming_ingestion import ingest_spectrum_chunks
 
 ABSORPTION_LINE_WIDTH = 30
 
 
-def scale_data_with_standard_scaler(data: Series):
+def scale_data_with_standard_scaler(data: Series | np.ndarray):
     """
     Масштабирует массив данных с помощью StandardScaler.
     """
     # Проверка входного массива
     if data.ndim == 1:  # Если данные одномерные, преобразуем в двумерные
-        data = data.to_numpy().reshape(-1, 1)
+        data = np.asarray(data).reshape(-1, 1)
 
     # Создание и применение StandardScaler
     scaler = StandardScaler()
@@ -29,46 +46,107 @@ def scale_data_with_standard_scaler(data: Series):
     return scaled_data.flatten()
 
 
-def normalize_energy(arr):
-    """Нормализовать массив так, чтобы его энергия была равна 1."""
-    norm = np.sqrt(np.sum(np.abs(arr) ** 2))
-    # Добавляем проверку на нули, чтобы избежать деления на нуль
-    return arr / norm if norm != 0 else arr
+def argmax_per_run(mask: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """
+    Индексы максимальных значений в каждой группе подряд идущих ненулевых элементов маски.
+
+    Совпадает с перебором групп scipy.ndimage.label и argmax по каждой (при равных значениях - первый индекс),
+    но выполняется за один проход: границы групп находятся по разности маски, максимумы групп - np.maximum.reduceat.
 
+    :param mask: Одномерная маска (ненулевые элементы - группы).
+    :param values: Значения той же длины.
+    :return: Индексы максимумов групп в порядке групп.
+    """
+    mask = np.asarray(mask) != 0
+    values = np.asarray(values)
+    # Начала и концы (не включая) групп
+    edges = np.diff(mask.astype(np.int8), prepend=0, append=0)
+    starts = np.flatnonzero(edges == 1)
+    stops = np.flatnonzero(edges == -1)
+    if len(starts) == 0:
+        return np.empty(0, dtype=np.intp)
+    # Значения всех групп подряд, смещения начал групп в нем
+    run_values = values[mask]
+    lengths = stops - starts
+    offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    run_max = np.maximum.reduceat(run_values, offsets)
+    # Первая позиция максимума в каждой группе
+    positions = np.where(run_values == np.repeat(run_max, lengths), np.arange(len(run_values)), len(run_values))
+    return np.minimum.reduceat(positions, offsets) - offsets + starts
+
+
+class BaselineFilterResult(NamedTuple):
+    """Результат проверки разницы спектров с веществом и без вещества в найденных пиках."""
+
+    # Индексы пиков до проверки
+    candidates: np.ndarray
+    # Запас with_gas - without_gas в каждом пике (NaN - нет значения без вещества)
+    margin: np.ndarray
+    # Маска пиков, прошедших проверку (margin > threshold)
+    passed: np.ndarray
+    # Порог (уровень шума спектра с веществом)
+    threshold: float
+
+    @property
+    def indices(self) -> np.ndarray:
+        """Индексы пиков, прошедших проверку."""
+        return self.candidates[self.passed]
+
+
+def filter_by_baseline_difference(
+    indices: np.ndarray, with_gas: np.ndarray, without_gas: np.ndarray, threshold: float
+) -> BaselineFilterResult:
+    """
+    Оставляет пики, в которых спектр с веществом превышает спектр без вещества больше чем на порог.
 
-def split_into_windows(input_list: list, window_width: int) -> np.ndarray:
-    """Разбивает список на перекрывающиеся окна заданной ширины и нормализует каждое окно."""
-    # Проверяем, чтобы длина input_list была больше или равна window_width
-    if len(input_list) < window_width:
-        return np.array([])  # Возврат пустого массива, если список слишком мал
-    windows = [input_list[i : i + window_width] for i in range(len(input_list) - window_width + 1)]
-    return np.array(windows)
+    :param indices: Индексы пиков.
+    :param with_gas: Значения спектра с веществом.
+    :param without_gas: Значения спектра без вещества на той же сетке.
+    :param threshold: Порог разницы.
+    :return: Индексы, запас по каждому пику и маска прошедших проверку.
+    """
+    indices = np.asarray(indices, dtype=np.intp)
+    margin = np.asarray(with_gas, dtype=np.float64)[indices] - np.asarray(without_gas, dtype=np.float64)[indices]
+    return BaselineFilterResult(indices, margin, margin > threshold, threshold)
 
 
-def interpolate_values(frequency, values, step=0.06):
+def interpolate_values(frequency, values, step=GRID_STEP):
     """
     Интерполирует значения (например, without_gas или with_gas) по частотам.
 
+    Линейная интерполяция на равномерную сетку от минимальной до максимальной частоты (resample_uniform).
+
     :param frequency: Исходные значения частот (список или Series).
     :param values: Исходные значения (например, without_gas или with_gas).
-    :param step: Шаг интерполяции, по умолчанию 1.
+    :param step: Шаг интерполяции, по умолчанию GRID_STEP.
 
     :return: Интерполированные значения.
     """
-    # Преобразуем входные данные в numpy массивы
-    frequency = np.asarray(frequency)
-    values = np.asarray(values)
     # Проверка, чтобы частоты и значения не были пустыми
     if len(frequency) == 0 or len(values) == 0:
         raise ValueError("Частоты и значения не могут быть пустыми.")
-    # Вычисляем новый диапазон частот
-    min_freq, max_freq = frequency.min(), frequency.max()
-    new_frequencies = np.arange(min_freq, max_freq + step, step)
-    # Создаем интерполятор
-    interpolator = interp1d(frequency, values, kind="linear", fill_value="extrapolate")
-    # Интерполируем данные для нового диапазона частот
-    new_gamma = interpolator(new_frequencies)
-    return new_frequencies, new_gamma
+    return resample_uniform(frequency, values, step)
+
+
+def prepare_spectrum_with_substance(frequency: list | Series, gamma: list | Series) -> PreparedSpectrum:
+    """
+    Подготовка спектра с веществом: интерполяция на сетку, оценка уровня шума и сглаживание.
+
+    Не изменяет данные DataAndProcessing, поэтому может выполняться в фоновом потоке.
+
+    :return: Частоты сетки, значения, порог шума.
+    """
+    return run_pipeline(frequency, gamma, WITH_SUBSTANCE_PIPELINE)
+
+
+def prepare_spectrum_without_substance(frequency: list | Series, gamma: list | Series) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Подготовка спектра без вещества: сглаживание и интерполяция на сетку.
+
+    Не изменяет данные DataAndProcessing, поэтому может выполняться в фоновом потоке.
+    """
+    prepared = run_pipeline(frequency, gamma, WITHOUT_SUBSTANCE_PIPELINE)
+    return prepared.frequency, prepared.gamma
 
 
 def spectra_will_be_changed(method):
@@ -86,14 +164,29 @@ def spectra_will_be_changed(method):
 
 
 def absorption_will_be_changed(method):
-    """Декоратор для вызова __absorption_interceptor после выполнения метода"""
+    """
+    Декоратор для вызова __absorption_interceptor после выполнения метода.
+
+    Если метод вернул описание изменения (AbsorptionChange), оно передается перехватчику аргументом change,
+    иначе передается ABSORPTION_RESET (изменено все). До изменения хранилища метод сообщает то же изменение
+    перехватчику __absorption_pre_interceptor (DataAndProcessing.__absorption_will_change). Если метод прервался
+    исключением, перехватчику передается ABSORPTION_RESET: сообщенное изменение могло быть выполнено частично.
+    """
 
     @wraps(method)
     def wrapper(self, *args, **kwargs):
-        result = method(self, *args, **kwargs)
         interceptor_attr = "_DataAndProcessing__absorption_interceptor"
-        if hasattr(self, interceptor_attr) and callable(getattr(self, interceptor_attr)):
-            getattr(self, interceptor_attr)(method.__name__, *args, **kwargs)
+
+        def call_interceptor(change: AbsorptionChange) -> None:
+            if hasattr(self, interceptor_attr) and callable(getattr(self, interceptor_attr)):
+                getattr(self, interceptor_attr)(method.__name__, *args, change=change, **kwargs)
+
+        try:
+            result = method(self, *args, **kwargs)
+        except Exception:
+            call_interceptor(ABSORPTION_RESET)
+            raise
+        call_interceptor(result if isinstance(result, AbsorptionChange) else ABSORPTION_RESET)
         return result
 
     return wrapper
@@ -104,29 +197,29 @@ class DataAndProcessing:
     # переопределив __slots__, удаляется __dict__, и объект может иметь только строго заданные атрибуты.
     # Защита от изменений полей вне методов класса (изменять значение полей можно только через методы данного класса)
     __slots__ = (
-        "__spectra_interceptor",
-        "__spectra",
-        "__point_absorption",
+        "__absorption_interceptor",
+        "__absorption_pre_interceptor",
+        "__inference_engine",
         "__neural_network",
+        "__point_absorption",
         "__smoothed_noise",
-        "__absorption_interceptor",
-    )
-    # Константы для инициализации пустых DataFrame
-    DEFAULT_SPECTROMETER_DATA: ClassVar[DataFrame] = DataFrame(columns=["frequency", "without_gas", "with_gas"])
-    DEFAULT_POINT_ABSORPTION: ClassVar[DataFrame] = DataFrame(
-        columns=["frequency", "gamma", "status", "source_neural_network"]
+        "__spectra",
+        "__spectra_interceptor",
     )
 
     def __init__(self):
         # Функция-перехватчик, вызываемая после выполнения метода
         self.__spectra_interceptor: Callable = lambda method_name, *args, **kwargs: None
         self.__absorption_interceptor: Callable = lambda method_name, *args, **kwargs: None
+        # Функция-перехватчик, вызываемая до изменения точек поглощения (с описанием предстоящего изменения)
+        self.__absorption_pre_interceptor: Callable[[AbsorptionChange], None] = lambda change: None
         # Данные со спектрометра
-        self.__spectra: DataFrame = DataAndProcessing.DEFAULT_SPECTROMETER_DATA.copy()
+        self.__spectra: SpectrumData = SpectrumData()
         # Точки, соответствующие линиям поглощения
-        self.__point_absorption: DataFrame = DataAndProcessing.DEFAULT_POINT_ABSORPTION.copy()
+        self.__point_absorption: AbsorptionPointStore = AbsorptionPointStore()
         # Нейронная сеть
         self.__neural_network: MLPClassifier | None = None
+        self.__inference_engine: MlpInferenceEngine | None = None
         self.__smoothed_noise = None
 
     # ---------------------------------------------------------------------------
@@ -140,18 +233,32 @@ class DataAndProcessing:
         """Устанавливает функцию, которая будет вызываться при вызове метода изменяющего частоты поглощения."""
         self.__absorption_interceptor = func
 
+    def set_absorption_pre_interceptor(self, func: Callable[[AbsorptionChange], None]) -> None:
+        """
+        Устанавливает функцию, которая будет вызываться до изменения частот поглощения с описанием изменения.
+
+        Изменение, переданное этой функции, затем передается функции set_absorption_interceptor (после изменения),
+        поэтому модель таблицы может обрамить его парой beginInsertRows/endInsertRows и т.п.
+        """
+        self.__absorption_pre_interceptor = func
+
+    def __absorption_will_change(self, change: AbsorptionChange) -> AbsorptionChange:
+        """Сообщает предстоящее изменение точек поглощения (до изменения хранилища)."""
+        self.__absorption_pre_interceptor(change)
+        return change
+
     # ---------------------------------------------------------------------------
     #   Очистка данных
     # ---------------------------------------------------------------------------
     @spectra_will_be_changed
     def clear_data_from_spectrometer(self):
         """Очищает данные спектрометра."""
-        self.__spectra = DataAndProcessing.DEFAULT_SPECTROMETER_DATA.copy()
+        self.__spectra = SpectrumData()
 
     @spectra_will_be_changed
     def clear_point_absorption(self):
         """Очищает таблицу точек поглощения."""
-        self.__point_absorption = DataAndProcessing.DEFAULT_POINT_ABSORPTION.copy()
+        self.__point_absorption = AbsorptionPointStore()
 
     @spectra_will_be_changed
     def clear_data(self):
@@ -165,85 +272,56 @@ class DataAndProcessing:
     @spectra_will_be_changed
     def set_spectrum_with_substance(self, frequency: list | Series, gamma: list | Series):
         """Добавляет данные в колонку 'with_gas' таблицы спектрометра."""
-        if len(frequency) != len(gamma):
-            raise ValueError("Количество частот не совпадает с количеством гамм")
-
-        # Преобразуем входные данные
-        frequency, gamma = interpolate_values(frequency, gamma)
-
-        cutoff_frequency = 0.1
-        sos = butter(3, cutoff_frequency, btype="highpass", analog=False, output="sos")
-        noise = sosfilt(sos, gamma)
-        self.__smoothed_noise = np.std(uniform_filter1d(noise, size=3)) * 5
-
-        if setting.SAVGOL_FILTER_WINDOW_LENGTH != 0:
-            gamma = savgol_filter(gamma, window_length=setting.SAVGOL_FILTER_WINDOW_LENGTH, polyorder=2)
-        # Интерполяция значений без газа
-        interpolated_frequencies, interpolated_gamma = interpolate_values(frequency, gamma)
-        # Частота пуста - данных не было - задаем
-        if self.__spectra["frequency"].empty:
-            self.__spectra["frequency"] = interpolated_frequencies
-            self.__spectra["with_gas"] = interpolated_gamma
-        else:
-            # Частота задана, проверяем что они совпадают
-            if self.__spectra["frequency"].shape[0] != interpolated_frequencies.shape[0] or not np.allclose(
-                self.__spectra["frequency"].to_numpy(), interpolated_frequencies
-            ):
-                if interpolated_frequencies.min() > self.__spectra["frequency"].min():
-                    good = self.__spectra["frequency"] >= interpolated_frequencies.min()
-                    self.__spectra = self.__spectra[good].reset_index()
-                if interpolated_frequencies.max() < self.__spectra["frequency"].max():
-                    good = self.__spectra["frequency"] <= interpolated_frequencies.max()
-                    self.__spectra = self.__spectra[good].reset_index()
-                self.__spectra["with_gas"] = interp1d(
-                    interpolated_frequencies,
-                    interpolated_gamma,
-                    bounds_error=True,
-                    copy=False,
-                    assume_sorted=True,
-                )(self.__spectra["frequency"])
-            else:
-                self.__spectra["with_gas"] = interpolated_gamma
+        frequency, gamma, self.__smoothed_noise = prepare_spectrum_with_substance(frequency, gamma)
+        self.__spectra.set_column("with_gas", frequency, gamma)
 
     @spectra_will_be_changed
     def set_spectrum_without_substance(self, frequency: list | Series, gamma: list | Series):
         """Добавляет данные в колонку 'without_gas' таблицы спектрометра."""
-        if len(frequency) != len(gamma):
-            raise ValueError("Количество частот не совпадает с количеством гамм")
-        # Преобразуем входные данные
-        if setting.SAVGOL_FILTER_WINDOW_LENGTH != 0:
-            gamma = savgol_filter(gamma, window_length=setting.SAVGOL_FILTER_WINDOW_LENGTH, polyorder=2)
-        frequency, gamma = interpolate_values(frequency, gamma)
-        # Интерполяция значений без газа
-        interpolated_frequencies, interpolated_gamma = interpolate_values(frequency, gamma)
-        # Частота пуста - данных не было - задаем
-        if self.__spectra["frequency"].empty:
-            self.__spectra["frequency"] = interpolated_frequencies
-            self.__spectra["without_gas"] = interpolated_gamma
-        else:
-            # Частота задана, проверяем что они совпадают
-            if self.__spectra["frequency"].shape[0] != interpolated_frequencies.shape[0] or not np.allclose(
-                self.__spectra["frequency"].to_numpy(), interpolated_frequencies
-            ):
-                if interpolated_frequencies.min() > self.__spectra["frequency"].min():
-                    good = self.__spectra["frequency"] >= interpolated_frequencies.min()
-                    self.__spectra = self.__spectra[good].reset_index()
-                if interpolated_frequencies.max() < self.__spectra["frequency"].max():
-                    good = self.__spectra["frequency"] <= interpolated_frequencies.max()
-                    self.__spectra = self.__spectra[good].reset_index()
-                self.__spectra["without_gas"] = interp1d(
-                    interpolated_frequencies,
-                    interpolated_gamma,
-                    bounds_error=True,
-                    copy=False,
-                    assume_sorted=True,
-                )(self.__spectra["frequency"])
-            else:
-                self.__spectra["without_gas"] = interpolated_gamma
+        self.__spectra.set_column("without_gas", *prepare_spectrum_without_substance(frequency, gamma))
+
+    @spectra_will_be_changed
+    def apply_spectrum_with_substance(self, frequency: np.ndarray, gamma: np.ndarray, smoothed_noise: float):
+        """Записывает в колонку 'with_gas' спектр, подготовленный prepare_spectrum_with_substance."""
+        self.__smoothed_noise = smoothed_noise
+        self.__spectra.set_column("with_gas", frequency, gamma)
+
+    @spectra_will_be_changed
+    def apply_spectrum_without_substance(self, frequency: np.ndarray, gamma: np.ndarray):
+        """Записывает в колонку 'without_gas' спектр, подготовленный prepare_spectrum_without_substance."""
+        self.__spectra.set_column("without_gas", frequency, gamma)
+
+    @spectra_will_be_changed
+    def set_spectrum_with_substance_chunks(
+        self, chunks: Iterable[tuple[np.ndarray, np.ndarray]], backing_path: str | None = None
+    ):
+        """
+        Потоковая запись данных в колонку 'with_gas' из итератора порций (частоты, гаммы).
+
+        Интерполяция на сетку, оценка шума и сглаживание выполняются по порциям с переносом состояния фильтров,
+        поэтому память при обработке не зависит от длины записи. При заданном backing_path результат хранится
+        в файлах, отображенных в память.
+        """
+        frequency, gamma, self.__smoothed_noise = ingest_spectrum_chunks(chunks, backing_path=backing_path)
+        self.__spectra.set_column("with_gas", frequency, gamma)
+
+    @spectra_will_be_changed
+    def set_spectrum_without_substance_chunks(
+        self, chunks: Iterable[tuple[np.ndarray, np.ndarray]], backing_path: str | None = None
+    ):
+        """Потоковая запись данных в колонку 'without_gas' из итератора порций (частоты, гаммы)."""
+        frequency, gamma, _ = ingest_spectrum_chunks(
+            chunks, estimate_noise=False, smooth_before_resample=True, backing_path=backing_path
+        )
+        self.__spectra.set_column("without_gas", frequency, gamma)
 
     @spectra_will_be_changed
     def set_neural_network(self, neural_network: MLPClassifier) -> None:
         self.__neural_network: MLPClassifier = neural_network
+        # Веса извлекаются один раз для прямого прохода на numpy
+        self.__inference_engine = (
+            None if neural_network is None else MlpInferenceEngine(neural_network, setting.INFERENCE_DTYPE)
+        )
 
     @absorption_will_be_changed
     def set_point_absorption(
@@ -253,28 +331,9 @@ class DataAndProcessing:
         status: list[bool] | Series | None = None,
         source_neural_network: list[bool] | Series | None = None,
     ):
-        """Загружает данные точек поглощения."""
-        # Проверка длины входных данных
-        if len(frequency) != len(gamma):
-            raise ValueError("Количество частот не совпадает с количеством значений гамма")
-
-        # Преобразуем входные данные в DataFrame с явным типом object для status
-        new_data = DataFrame(
-            {
-                "frequency": frequency,
-                "gamma": gamma,
-                "status": status,
-                "source_neural_network": source_neural_network,
-            }
-        ).astype({"status": "object"})  # Если не указать, то столбец числовой и при передаче None получим NaN
-
-        # Если таблица пуста, присваиваем новые данные, иначе добавляем и сортируем
-        if self.__point_absorption.empty:
-            self.__point_absorption = new_data
-        else:
-            self.__point_absorption = concat([self.__point_absorption, new_data], ignore_index=True).sort_values(
-                by="frequency", ignore_index=True
-            )
+        """Загружает данные точек поглощения (добавляются к текущим с сортировкой по частоте)."""
+        self.__absorption_will_change(ABSORPTION_RESET)
+        self.__point_absorption.merge(frequency, gamma, status, source_neural_network)
 
     # ---------------------------------------------------------------------------
     #   Getters - получение данных
@@ -297,10 +356,10 @@ class DataAndProcessing:
         hidden_layer_sizes = self.__neural_network.hidden_layer_sizes
         return num_inputs, hidden_layer_sizes
 
-    def get_spectra(self) -> DataFrame:
+    def get_spectra(self) -> SpectrumData:
         return self.__spectra
 
-    def get_point_absorption(self) -> DataFrame:
+    def get_point_absorption(self) -> AbsorptionPointStore:
         return self.__point_absorption
 
     # ---------------------------------------------------------------------------
@@ -308,39 +367,80 @@ class DataAndProcessing:
     # ---------------------------------------------------------------------------
     @spectra_will_be_changed
     @absorption_will_be_changed
-    def processing(self, filling_blanks=True):
+    def processing(
+        self,
+        filling_blanks=True,
+        batch_size: int | None = None,
+        workers: int | None = None,
+        executor: str | None = None,
+    ):
+        """
+        Поиск линий поглощения нейронной сетью.
+
+        :param filling_blanks: Устранять "дыры" в результатах.
+        :param batch_size: Количество окон в пакете при предсказании (None - из настроек или по бюджету памяти).
+        :param workers: Количество параллельных исполнителей (None - setting.INFERENCE_WORKERS).
+        :param executor: Тип исполнителей "thread" или "process" (None - setting.INFERENCE_EXECUTOR).
+        """
+        point_absorption = self.compute_absorption(filling_blanks, batch_size, workers, executor)
+        self.__absorption_will_change(ABSORPTION_RESET)
+        # Очистка прошлых результатов
+        self.clear_point_absorption()
+        self.__point_absorption = point_absorption
+
+    @spectra_will_be_changed
+    @absorption_will_be_changed
+    def apply_absorption(self, point_absorption: AbsorptionPointStore):
+        """Записывает точки поглощения, найденные compute_absorption."""
+        self.__absorption_will_change(ABSORPTION_RESET)
+        self.__point_absorption = point_absorption
+
+    def compute_absorption(
+        self,
+        filling_blanks=True,
+        batch_size: int | None = None,
+        workers: int | None = None,
+        executor: str | None = None,
+        progress: Callable[[int, int], None] | None = None,
+    ) -> AbsorptionPointStore:
+        """
+        Поиск линий поглощения нейронной сетью без изменения данных (можно выполнять в фоновом потоке).
+
+        Параметры как у processing.
+        :param progress: Функция прогресса предсказания (обработано окон, всего окон).
+        :return: Найденные точки поглощения.
+        """
         # Проверка наличия данных и нейронной сети
-        if self.__spectra["with_gas"].empty:
+        if not self.__spectra.has_with_gas:
             raise ValueError("Для обработки отсутствуют данные с веществом")
         if self.__neural_network is None:
             raise ValueError("Для обработки отсутствует нейронная сеть")
 
-        if self.__spectra["with_gas"].isna().any():
-            raise ValueError(self.__spectra["with_gas"])
-
-        # Очистка прошлых результатов
-        self.clear_point_absorption()
+        with_gas = self.__spectra.with_gas
+        if np.isnan(with_gas).any():
+            raise ValueError("В данных с веществом есть пропуски (NaN)")
 
         # Определение количества входов в нейронную сеть
         num_inputs = self.__neural_network.n_features_in_
 
         # Подготовка окон для нейронной сети
-        gamma = scale_data_with_standard_scaler(self.__spectra["with_gas"])
-        windows = split_into_windows(gamma, num_inputs)
+        gamma = scale_data_with_standard_scaler(with_gas)
 
         # Проверка наличия окон
-        if len(windows) == 0:
+        if len(gamma) < num_inputs:
             raise ValueError(
                 "Недостаточно данных для анализа нейронной сетью. Проверьте параметры окон или количество данных."
             )
 
-        # Предсказание нейронной сети
-        result = self.__neural_network.predict(windows)
+        # Предсказание нейронной сети (пакетами ограниченного размера, при workers > 1 - параллельно по частям)
+        result = predict_windows_parallel(
+            self.__neural_network, gamma, num_inputs, workers, executor, batch_size, self.__inference_engine, progress
+        )
 
         # Добавление нулей на края для выравнивания длины
         result = np.pad(
             result,
-            (len(self.__spectra["with_gas"]) - len(result)) // 2,
+            (len(with_gas) - len(result)) // 2,
             mode="constant",
         )
 
@@ -351,93 +451,84 @@ class DataAndProcessing:
                 iterations=ABSORPTION_LINE_WIDTH // 4,
             )
 
-        # Обработка групп подряд идущих единиц
-        labeled_array, num_features = label(result)
-        indices = []
-
-        for group_label in range(1, num_features + 1):
-            # Находим индексы текущей группы
-            group_indices = np.where(labeled_array == group_label)[0]
-            # Выбираем индекс элемента с максимальным значением 'with_gas'
-            max_index = group_indices[self.__spectra.loc[group_indices, "with_gas"].argmax()]
-            indices.append(max_index)
+        # Обработка групп подряд идущих единиц: в каждой группе выбираем индекс элемента с максимальным 'with_gas'
+        indices = argmax_per_run(result, with_gas)
+        margin = np.full(len(indices), np.nan)
 
         # Проверка разницы между with_gas и without_gas
         # хай пас фильтр на 5 точек, с очень большой частотой отсечки
-        if not self.__spectra["without_gas"].empty and not self.__spectra["without_gas"].isna().all():
+        if self.__spectra.has_without_gas:
             # Фильтрация точек, где разница положительна и превышает отклонение
-            indices = [
-                idx
-                for idx in indices
-                if self.__spectra.loc[idx, "with_gas"] - self.__spectra.loc[idx, "without_gas"] > self.__smoothed_noise
-            ]
-
-        # Формирование результата
-        self.__point_absorption = DataFrame(
-            {
-                "frequency": self.__spectra.loc[indices, "frequency"],
-                "gamma": self.__spectra.loc[indices, "with_gas"],
-                "status": None,
-                "source_neural_network": True,
-            }
-        ).reset_index(drop=True)
+            baseline_filter = filter_by_baseline_difference(
+                indices, with_gas, self.__spectra.without_gas, self.__smoothed_noise
+            )
+            indices, margin = baseline_filter.indices, baseline_filter.margin[baseline_filter.passed]
+
+        # Формирование результата (margin - запас with_gas - without_gas, NaN без спектра без вещества)
+        return AbsorptionPointStore.from_arrays(
+            self.__spectra.frequency[indices], with_gas[indices], None, True, margin
+        )
 
     # ---------------------------------------------------------------------------
     #   Методы для работы с графиком
     # ---------------------------------------------------------------------------
     def get_status_point_absorption(self, frequency: float, gamma: float):
         """Возвращает индекс, статус и источник точки поглощения с заданными координатами."""
-        mask = (self.__point_absorption["frequency"] == frequency) & (self.__point_absorption["gamma"] == gamma)
-        result = self.__point_absorption.loc[mask, ["status", "source_neural_network"]]
-        if not result.empty:
-            index = result.index[0]
-            status = result.iloc[0]["status"]
-            source_neural_network = result.iloc[0]["source_neural_network"]
-            return index, status, source_neural_network
-        return None, None, None
+        index = self.__point_absorption.find(frequency, gamma)
+        if index is None:
+            return None, None, None
+        return (
+            index,
+            self.__point_absorption.get_status(index),
+            bool(self.__point_absorption.source_neural_network[index]),
+        )
 
     @absorption_will_be_changed
-    def set_status_point_absorption_by_index(self, index: int, new_status: bool | None):
+    def set_status_point_absorption_by_index(self, index: int, new_status: bool | None) -> AbsorptionChange:
         """Обновляет статус для точки поглощения по индексу."""
-        if 0 <= index < len(self.__point_absorption):
-            self.__point_absorption.loc[index, "status"] = new_status
+        if not 0 <= index < len(self.__point_absorption):
+            return self.__absorption_will_change(AbsorptionChange(CHANGE_STATUS))
+        change = self.__absorption_will_change(AbsorptionChange(CHANGE_STATUS, (index,)))
+        self.__point_absorption.set_status(index, new_status)
+        return change
 
     @absorption_will_be_changed
-    def set_status_point_absorption_by_coordinates(self, frequency: float, gamma: float, new_status: bool):
+    def set_status_point_absorption_by_coordinates(
+        self, frequency: float, gamma: float, new_status: bool
+    ) -> AbsorptionChange:
         """Обновляет статус для точки поглощения по координатам."""
-        mask = (self.__point_absorption["frequency"] == frequency) & (self.__point_absorption["gamma"] == gamma)
-        self.__point_absorption.loc[mask, "status"] = new_status
+        indices = self.__point_absorption.indices_of(frequency, gamma)
+        change = self.__absorption_will_change(AbsorptionChange(CHANGE_STATUS, tuple(indices.tolist())))
+        self.__point_absorption.set_status(indices, new_status)
+        return change
 
     @absorption_will_be_changed
-    def add_new_point_absorption(self, frequency: float, gamma: float):
+    def add_new_point_absorption(self, frequency: float, gamma: float) -> AbsorptionChange:
         """Метод добавляет новую точку поглощения с заданными координатами."""
-        new_point = DataFrame(
-            {
-                "frequency": [frequency],
-                "gamma": [gamma],
-                "status": [True],
-                "source_neural_network": [False],
-            }
-        )
-        self.__point_absorption = (
-            new_point
-            if self.__point_absorption.empty
-            else concat([self.__point_absorption, new_point], ignore_index=True).sort_values(
-                by="frequency", ignore_index=True
-            )
-        )
+        index = self.__point_absorption.insertion_index(frequency)
+        change = self.__absorption_will_change(AbsorptionChange(CHANGE_INSERT, (index,)))
+        self.__point_absorption.insert(frequency, gamma, status=True, source_neural_network=False)
+        return change
 
     @absorption_will_be_changed
-    def del_point_absorption(self, frequency: float, gamma: float):
+    def del_point_absorption(self, frequency: float, gamma: float) -> AbsorptionChange:
         """Удаляет точку поглощения, если она была добавлена в ручную"""
-        mask = (self.__point_absorption["frequency"] == frequency) & (self.__point_absorption["gamma"] == gamma)
-        to_delete = self.__point_absorption[mask & (not self.__point_absorption["source_neural_network"])]
-        if not to_delete.empty:
-            self.__point_absorption = self.__point_absorption.drop(to_delete.index).reset_index(drop=True)
+        # С конца, чтобы индексы еще не удаленных точек не сдвигались
+        deleted = tuple(
+            index
+            for index in self.__point_absorption.indices_of(frequency, gamma)[::-1].tolist()
+            if not self.__point_absorption.source_neural_network[index]
+        )
+        change = self.__absorption_will_change(AbsorptionChange(CHANGE_DELETE, deleted))
+        for index in deleted:
+            self.__point_absorption.delete(index)
+        return change
 
     @absorption_will_be_changed
-    def del_point_absorption_by_index(self, index: int):
+    def del_point_absorption_by_index(self, index: int) -> AbsorptionChange:
         """Удаляет точку поглощения по индексу, если она была добавлена вручную"""
-        if 0 <= index < len(self.__point_absorption):
-            if not self.__point_absorption.loc[index, "source_neural_network"]:
-                self.__point_absorption = self.__point_absorption.drop(index).reset_index(drop=True)
+        if 0 <= index < len(self.__point_absorption) and not self.__point_absorption.source_neural_network[index]:
+            change = self.__absorption_will_change(AbsorptionChange(CHANGE_DELETE, (index,)))
+            self.__point_absorption.delete(index)
+            return change
+        return self.__absorption_will_change(AbsorptionChange(CHANGE_DELETE))
@@ -0,0 +1,33 @@
+import numpy as np
+
+
+class FrequencyIndex:
+    """
+    Отсортированный индекс частот спектра для выборки диапазона двоичным поиском.
+
+    Строится один раз на файл. Частоты в файлах спектрометра монотонны, поэтому для возрастающих частот индекс
+    не хранит копий, а выборка диапазона возвращает срезы (представления) исходных массивов.
+    Для убывающих или неупорядоченных частот один раз строится перестановка сортировки.
+    """
+
+    __slots__ = ("order", "sorted_frequency")
+
+    def __init__(self, frequency: np.ndarray):
+        frequency = np.asarray(frequency)
+        # Перестановка в порядок возрастания (None - частоты уже возрастают)
+        self.order: np.ndarray | None = None
+        if len(frequency) > 1 and not np.all(frequency[1:] >= frequency[:-1]):
+            self.order = np.argsort(frequency, kind="stable")
+        self.sorted_frequency: np.ndarray = frequency if self.order is None else frequency[self.order]
+
+    def select(self, start_frequency: float, end_frequency: float) -> slice | np.ndarray:
+        """
+        Находит элементы с частотой в диапазоне [start_frequency, end_frequency].
+
+        :return: Срез (для возрастающих частот) или массив индексов в исходном порядке.
+        """
+        first = int(np.searchsorted(self.sorted_frequency, start_frequency, side="left"))
+        last = int(np.searchsorted(self.sorted_frequency, end_frequency, side="right"))
+        if self.order is None:
+            return slice(first, max(first, last))
+        return np.sort(self.order[first:last])
@@ -19,8 +19,8 @@ from PySide6.QtWidgets import (QAbstractItemView, QAbstractScrollArea, QApplicat
     QComboBox, QDialog, QFrame, QGroupBox,
     QHBoxLayout, QHeaderView, QLabel, QLayout,
     QLineEdit, QPushButton, QRadioButton, QScrollArea,
-    QSizePolicy, QSpacerItem, QTableWidget, QTableWidgetItem,
-    QVBoxLayout, QWidget)
+    QSizePolicy, QSpacerItem, QTableView, QVBoxLayout,
+    QWidget)
 
 
 class Ui_Dialog(object):
@@ -346,17 +346,17 @@ class Ui_Dialog(object):
 "}\n"
 "\n"
 "/*------------------------------------------------*/\n"
-"/*   TableWidget													*/\n"
+"/*   TableView													*/\n"
 "/*------------------------------------------------*/\n"
-"QTableWidget {\n"
+"QTableView {\n"
 "    gridline-color: rgb(136, 136, 136);					/* \u0423\u0441\u0442\u0430\u043d\u0430\u0432\u043b\u0438\u0432\u0430\u0435\u0442 \u0446\u0432\u0435\u0442 \u043b\u0438\u043d\u0438\u0439 \u0441\u0435\u0442\u043a\u0438 */\n"
 "    border-top: 1px solid rgb(54, 60, 74);			/* \u0417\u0430\u0434\u0430\u0435\u0442 \u0432\u0435\u0440\u0445\u043d\u044e\u044e \u0433\u0440\u0430\u043d\u0438\u0446\u0443 */\n"
 "    border-bottom: 1px solid rgb(54, 60, 74);	/* \u0417\u0430\u0434\u0430\u0435\u0442 \u043d\u0438\u0436\u043d\u044e\u044e \u0433\u0440\u0430\u043d\u0438\u0446\u0443 */\n"
 "}\n"
 "\n"
-"QTableWidget::item:selected {\n"
-"    background-color: rgb(72, 81, 94);				/* \u0423\u0441\u0442"
-                        "\u0430\u043d\u0430\u0432\u043b\u0438\u0432\u0430\u0435\u0442 \u0444\u043e\u043d \u0434\u043b\u044f \u0432\u044b\u0431\u0440\u0430\u043d\u043d\u044b\u0445 \u044d\u043b\u0435\u043c\u0435\u043d\u0442\u043e\u0432 */\n"
+"QTableView::item:selected {\n"
+"    background-color: rgb(72, 81, 94);				/* \u0423\u0441\u0442\u0430"
+                        "\u043d\u0430\u0432\u043b\u0438\u0432\u0430\u0435\u0442 \u0444\u043e\u043d \u0434\u043b\u044f \u0432\u044b\u0431\u0440\u0430\u043d\u043d\u044b\u0445 \u044d\u043b\u0435\u043c\u0435\u043d\u0442\u043e\u0432 */\n"
 "}\n"
 "\n"
 "QHeaderView {\n"
@@ -366,8 +366,8 @@ class Ui_Dialog(object):
 "/* \u0421\u0442\u0438\u043b\u044c \u0434\u043b\u044f \u0441\u0435\u043a\u0446\u0438\u0439 \u0437\u0430\u0433\u043e\u043b\u043e\u0432\u043a\u043e\u0432 \u0442\u0430\u0431\u043b\u0438\u0446\u044b */\n"
 "QHeaderView::section {\n"
 "    background-color: rgb(37, 41, 48);				/* \u0417\u0430\u0434\u0430\u0435\u0442 \u0444\u043e\u043d \u0437\u0430\u0433\u043e\u043b\u043e\u0432\u043a\u043e\u0432 */\n"
-"    border: 1px solid rgb(136, 136, 136);				/* \u0423\u0441\u0442\u0430\u043d\u0430\u0432\u043b\u0438\u0432\u0430\u0435\u0442 \u0433"
-                        "\u0440\u0430\u043d\u0438\u0446\u0443 */\n"
+"    border: 1px solid rgb(136, 136, 136);				/* \u0423\u0441\u0442\u0430\u043d\u0430\u0432\u043b\u0438\u0432\u0430\u0435\u0442 \u0433\u0440"
+                        "\u0430\u043d\u0438\u0446\u0443 */\n"
 "    border-style: none;											/* \u0423\u0431\u0438\u0440\u0430\u0435\u0442 \u0441\u0442\u0438\u043b\u044c \u0433\u0440\u0430\u043d\u0438\u0446\u044b */\n"
 "}\n"
 "\n"
@@ -1145,33 +1145,31 @@ class Ui_Dialog(object):
 
         self.layout_table.addWidget(self.widget_table_view_mode)
 
-        self.tableWidget_frequency_absorption = QTableWidget(self.widget_table)
-        self.tableWidget_frequency_absorption.setObjectName(u"tableWidget_frequency_absorption")
+        self.tableView_frequency_absorption = QTableView(self.widget_table)
+        self.tableView_frequency_absorption.setObjectName(u"tableView_frequency_absorption")
         sizePolicy8 = QSizePolicy(QSizePolicy.Policy.Ignored, QSizePolicy.Policy.Expanding)
         sizePolicy8.setHorizontalStretch(0)
         sizePolicy8.setVerticalStretch(0)
-        sizePolicy8.setHeightForWidth(self.tableWidget_frequency_absorption.sizePolicy().hasHeightForWidth())
-        self.tableWidget_frequency_absorption.setSizePolicy(sizePolicy8)
-        self.tableWidget_frequency_absorption.setStyleSheet(u"")
-        self.tableWidget_frequency_absorption.setFrameShape(QFrame.Shape.NoFrame)
-        self.tableWidget_frequency_absorption.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
-        self.tableWidget_frequency_absorption.setSizeAdjustPolicy(QAbstractScrollArea.SizeAdjustPolicy.AdjustToContents)
-        self.tableWidget_frequency_absorption.setEditTriggers(QAbstractItemView.EditTrigger.AnyKeyPressed|QAbstractItemView.EditTrigger.EditKeyPressed)
-        self.tableWidget_frequency_absorption.setTabKeyNavigation(False)
-        self.tableWidget_frequency_absorption.setProperty(u"showDropIndicator", False)
-        self.tableWidget_frequency_absorption.setDragDropOverwriteMode(False)
-        self.tableWidget_frequency_absorption.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
-        self.tableWidget_frequency_absorption.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
-        self.tableWidget_frequency_absorption.setIconSize(QSize(0, 0))
-        self.tableWidget_frequency_absorption.setShowGrid(True)
-        self.tableWidget_frequency_absorption.setSortingEnabled(False)
-        self.tableWidget_frequency_absorption.setRowCount(0)
-        self.tableWidget_frequency_absorption.setColumnCount(0)
-        self.tableWidget_frequency_absorption.horizontalHeader().setCascadingSectionResizes(False)
-        self.tableWidget_frequency_absorption.horizontalHeader().setProperty(u"showSortIndicator", False)
-        self.tableWidget_frequency_absorption.horizontalHeader().setStretchLastSection(True)
-
-        self.layout_table.addWidget(self.tableWidget_frequency_absorption)
+        sizePolicy8.setHeightForWidth(self.tableView_frequency_absorption.sizePolicy().hasHeightForWidth())
+        self.tableView_frequency_absorption.setSizePolicy(sizePolicy8)
+        self.tableView_frequency_absorption.setStyleSheet(u"")
+        self.tableView_frequency_absorption.setFrameShape(QFrame.Shape.NoFrame)
+        self.tableView_frequency_absorption.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.tableView_frequency_absorption.setSizeAdjustPolicy(QAbstractScrollArea.SizeAdjustPolicy.AdjustToContents)
+        self.tableView_frequency_absorption.setEditTriggers(QAbstractItemView.EditTrigger.AnyKeyPressed|QAbstractItemView.EditTrigger.EditKeyPressed)
+        self.tableView_frequency_absorption.setTabKeyNavigation(False)
+        self.tableView_frequency_absorption.setProperty(u"showDropIndicator", False)
+        self.tableView_frequency_absorption.setDragDropOverwriteMode(False)
+        self.tableView_frequency_absorption.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.tableView_frequency_absorption.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.tableView_frequency_absorption.setIconSize(QSize(0, 0))
+        self.tableView_frequency_absorption.setShowGrid(True)
+        self.tableView_frequency_absorption.setSortingEnabled(False)
+        self.tableView_frequency_absorption.horizontalHeader().setCascadingSectionResizes(False)
+        self.tableView_frequency_absorption.horizontalHeader().setProperty(u"showSortIndicator", False)
+        self.tableView_frequency_absorption.horizontalHeader().setStretchLastSection(True)
+
+        self.layout_table.addWidget(self.tableView_frequency_absorption)
 
         self.widget_bottom = QWidget(self.widget_table)
         self.widget_bottom.setObjectName(u"widget_bottom")
@@ -1,16 +1,30 @@
 import os
+from collections.abc import Callable
 
+import numpy as np
 from joblib import load
 from functools import partial
-from pyqtgraph.Qt.QtCore import QSettings
-from pyqtgraph.Qt.QtWidgets import QFileDialog, QTableWidgetItem
+from pyqtgraph.Qt.QtCore import QModelIndex, QSettings, QThreadPool, Qt
+from pyqtgraph.Qt.QtWidgets import QFileDialog, QHeaderView, QProgressDialog
 
 from detector_neural_network import setting
+from detector_neural_network.absorption_points import ABSORPTION_RESET, STATUS_CONFIRMED, AbsorptionChange
+from detector_neural_network.absorption_table_model import (
+    COLUMN_STATUS,
+    AbsorptionFilterProxyModel,
+    AbsorptionStatusDelegate,
+    AbsorptionTableModel,
+)
 from detector_neural_network.app_exception import AppException
+from detector_neural_network.background_task import BackgroundTask
 from detector_neural_network.custom_dialog import CustomDialog
-from detector_neural_network.parser import parser, parser_all_data
-from detector_neural_network.multi_check_box import BlueRedYellowCheckBox, GreenRedYellowCheckBox
+from detector_neural_network.data_and_processing import (
+    prepare_spectrum_with_substance,
+    prepare_spectrum_without_substance,
+)
 from detector_neural_network.plot_spectrometer_data import SpectrometerPlotAndLegendWidget, SpectrometerPlotWidget
+from detector_neural_network.result_file import get_result_file_name, read_result_file, write_result_file
+from detector_neural_network.spectrum_reader import SpectrumFile
 from detector_neural_network.setting import (
     DEFAULT_FILE_PATH_WITHOUT_SUBSTANCE,
     DEFAULT_FILE_PATH_WITH_SUBSTANCE,
@@ -18,6 +32,30 @@ from detector_neural_network.setting import (
 )
 
 settings = QSettings(setting.ORGANIZATION, setting.APPLICATION)
+# Задержка появления окна прогресса фоновой операции (мс), быстрые операции выполняются без него
+PROGRESS_DIALOG_DELAY_MS = 300
+
+
+def read_and_prepare_spectrum(
+    task: BackgroundTask,
+    file_name: str | None,
+    spectrum_file: SpectrumFile | None,
+    frequency_range: tuple[float, float] | None,
+    prepare: Callable,
+) -> tuple[SpectrumFile, tuple | None]:
+    """
+    Чтение файла спектра (если он еще не прочитан) и подготовка данных в фоновой задаче.
+
+    :return: Файл спектра и результат prepare (None - файл пуст).
+    """
+    if spectrum_file is None:
+        spectrum_file = SpectrumFile(file_name, progress=task.report_progress)
+    if not spectrum_file:
+        return spectrum_file, None
+    # Подготовка данных - объем неизвестен
+    task.report_progress(0)
+    frequency, gamma = spectrum_file.get_data(*frequency_range) if frequency_range else spectrum_file.get_data()
+    return spectrum_file, prepare(frequency, gamma)
 
 
 class GuiProgram(CustomDialog):
@@ -27,6 +65,14 @@ class GuiProgram(CustomDialog):
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        # Пул потоков для чтения файлов и обработки (окно не блокируется на время операции)
+        self.thread_pool = QThreadPool.globalInstance()
+        self.background_task: BackgroundTask | None = None
+        # Таблица точек поглощения: модель над данными, фильтр режима отображения и отрисовка статуса
+        self.absorption_table_model = AbsorptionTableModel(self.data, self)
+        self.absorption_table_proxy = AbsorptionFilterProxyModel(self)
+        self.absorption_table_proxy.setSourceModel(self.absorption_table_model)
+        self.absorption_status_delegate = AbsorptionStatusDelegate(icon_size=22, parent=self)
 
         # Обработчики нажатий кнопок интерфейса
         # - Загрузка нейронной сети
@@ -51,21 +97,24 @@ class GuiProgram(CustomDialog):
         self.layout_plot_1.addWidget(self.plot_widget_1)
         # Устанавливаем метод вызываемый при обновлении частот поглощения
         self.data.set_absorption_interceptor(self.update_ui_on_absorption_change)
+        # - и метод, вызываемый до их изменения (начало вставки и удаления строк таблицы)
+        self.data.set_absorption_pre_interceptor(self.absorption_table_model.about_to_change)
 
         # Таблица
         # - Фильтр
-        self.comboBox_select_table_view.currentIndexChanged.connect(self.table)
+        self.comboBox_select_table_view.currentIndexChanged.connect(self.absorption_table_proxy.set_filter_mode)
         # - Инициализация пустой таблицы с заголовками
         self.initialize_table()
+        # - Клик по статусу точки
+        self.absorption_status_delegate.clicked.connect(self.frequency_selection)
         # - Сохранить данные из таблицы в файл
         self.pushButton_save_table_to_file.clicked.connect(self.saving_result_data)
         # - Загрузить данные в таблицу из файла
         self.pushButton_load_result.clicked.connect(self.load_result_data)
         # - Выбрана строка таблицы zoom
-        self.tableWidget_frequency_absorption.cellClicked.connect(self.get_clicked_cell)
-        self.comboBox_select_table_view.currentIndexChanged.connect(self.table)
+        self.tableView_frequency_absorption.clicked.connect(self.get_clicked_cell)
         # # - Выбран заголовок таблицы
-        # self.tableWidget_frequency_absorption.horizontalHeader().sectionClicked.connect(self.click_handler)
+        # self.tableView_frequency_absorption.horizontalHeader().sectionClicked.connect(self.click_handler)
 
     # ---------------------------------------------------------------------------
     #   Алгоритм работы приложения
@@ -74,21 +123,30 @@ class GuiProgram(CustomDialog):
         """Загрузка нейронной сети"""
         # 1. Получение имени файла из диалогового окна (в режиме DEBUG используется путь по умолчанию)
         if setting.DEBUG_ALL or setting.USE_DEFAULT_FILE_PATH_NEURAL_NETWORK:
-            self.file_name_neural_network = setting.DEFAULT_FILE_PATH_NEURAL_NETWORK
+            file_name = setting.DEFAULT_FILE_PATH_NEURAL_NETWORK
         else:
             # - Загружаем последнюю успешную директорию, если она есть, иначе используем текущую (".")
             last_dir = settings.value("last_neural_network_dir", DEFAULT_FILE_PATH_NEURAL_NETWORK, type=str)
-            self.file_name_neural_network, _ = QFileDialog.getOpenFileName(
+            file_name, _ = QFileDialog.getOpenFileName(
                 self,
                 """Выбрать файл "Нейронной сети" """,
                 last_dir,
                 "Neural network(*.joblib);;All Files(*)",
             )
         # - Если диалог закрыт через крестик или отменён, просто выходим
-        if not self.file_name_neural_network:
+        if not file_name:
             return
-        # 2. Загрузка модели
-        self.data.set_neural_network(load(self.file_name_neural_network))
+        # 2. Загрузка модели в фоновом потоке
+        self.run_in_background(
+            "Загрузка нейронной сети...",
+            lambda task: load(file_name),
+            partial(self.apply_neural_network, file_name),
+        )
+
+    def apply_neural_network(self, file_name: str, neural_network):
+        """Установка загруженной нейронной сети (в потоке интерфейса)"""
+        self.file_name_neural_network = file_name
+        self.data.set_neural_network(neural_network)
         # 3. Получение количества входов и скрытых слоев, отображение в UI
         num_inputs, hidden_layer_sizes = self.data.get_neural_network_info()
         self.label_parameters_neural_network.setText(f"Кол-во вх: {num_inputs}\nРазмеры слоев: {hidden_layer_sizes}")
@@ -97,40 +155,50 @@ class GuiProgram(CustomDialog):
 
     def reading_and_plotting_data_without_substance(self, skip_read=False):
         """Чтение и построение сигнала без вещества"""
+        file_name, spectrum_file = self.file_name_without_substance, self.spectrum_file_without_gas
         # 1. Чтения файла (если файл тот же - пропускаем)
         if not skip_read:
             # Получение имени файла из диалогового окна (в режиме DEBUG используется путь по умолчанию)
             if setting.DEBUG_ALL or setting.USE_DEFAULT_FILE_PATH_WITHOUT_SUBSTANCE:
-                self.file_name_without_substance = setting.DEFAULT_FILE_PATH_WITHOUT_SUBSTANCE
+                file_name = setting.DEFAULT_FILE_PATH_WITHOUT_SUBSTANCE
             else:
                 # - Загружаем последнюю успешную директорию, если она есть, иначе используем текущую (".")
                 last_dir = settings.value("last_without_substance_dir", DEFAULT_FILE_PATH_WITHOUT_SUBSTANCE, type=str)
-                self.file_name_without_substance, _ = QFileDialog.getOpenFileName(
+                file_name, _ = QFileDialog.getOpenFileName(
                     self,
                     "Выбрать файл 'Данные без вещества'",
                     last_dir,
                     "Spectrometer Data(*.csv);;All Files(*)",
                 )
             # - Если диалог закрыт через крестик или отменён, просто выходим
-            if not self.file_name_without_substance:
+            if not file_name:
                 return
-            # Чтение данных
-            with open(self.file_name_without_substance) as file:
-                self.lines_file_without_gas = file.readlines()
+            spectrum_file = None
         # - Если файл не прочитан - скип
-        if not self.lines_file_without_gas:
+        elif not spectrum_file:
+            return
+        # 2. Чтение (файл отображается в память) и подготовка данных в фоновом потоке
+        self.run_in_background(
+            "Чтение спектра без вещества...",
+            partial(
+                read_and_prepare_spectrum,
+                file_name=file_name,
+                spectrum_file=spectrum_file,
+                frequency_range=self.get_selected_frequency_range(),
+                prepare=prepare_spectrum_without_substance,
+            ),
+            partial(self.apply_spectrum_without_substance, file_name),
+        )
+
+    def apply_spectrum_without_substance(self, file_name: str, loaded: tuple[SpectrumFile, tuple | None]):
+        """Сохранение и построение подготовленного сигнала без вещества (в потоке интерфейса)"""
+        self.file_name_without_substance = file_name
+        self.spectrum_file_without_gas, prepared = loaded
+        # - Если файл не прочитан - скип
+        if prepared is None:
             return
-            # 2. В зависимости от режима - парсим
-        if self.radioButton_selected_range.isChecked():
-            # Запрашиваем начало и конец диапазона спектра, из UI с валидацией
-            start_frequency, end_frequency = self.get_spectrum_frequency_range()
-            # Парс данных в заданных частотах
-            frequency, gamma = parser(self.lines_file_without_gas, start_frequency, end_frequency)
-        else:
-            # Парс данных
-            frequency, gamma = parser_all_data(self.lines_file_without_gas)
         # 3. Сохраняем данных
-        self.data.set_spectrum_without_substance(frequency, gamma)
+        self.data.apply_spectrum_without_substance(*prepared)
         # 4. Отображаем данные на графике
         self.update_graphics()
         # - Сохранение директории для следующего открытия диалога
@@ -138,55 +206,95 @@ class GuiProgram(CustomDialog):
 
     def reading_and_plotting_data_with_substance(self, skip_read=False):
         """Чтение и построение сигнала с веществом"""
+        file_name, spectrum_file = self.file_name_with_substance, self.spectrum_file_with_gas
         # 1. Чтения файла (если файл тот же - пропускаем)
         if not skip_read:
             # Получение имени файла из диалогового окна (в режиме DEBUG используется путь по умолчанию)
             if setting.DEBUG_ALL or setting.USE_DEFAULT_FILE_PATH_WITH_SUBSTANCE:
-                self.file_name_with_substance = setting.DEFAULT_FILE_PATH_WITH_SUBSTANCE
+                file_name = setting.DEFAULT_FILE_PATH_WITH_SUBSTANCE
             else:
                 # - Загружаем последнюю успешную директорию, если она есть, иначе используем текущую (".")
                 last_dir = settings.value("last_with_substance_dir", DEFAULT_FILE_PATH_WITH_SUBSTANCE, type=str)
-                self.file_name_with_substance, _ = QFileDialog.getOpenFileName(
+                file_name, _ = QFileDialog.getOpenFileName(
                     self,
                     "Выбрать файл 'Данные c веществом'",
                     last_dir,
                     "Spectrometer Data(*.csv);;All Files(*)",
                 )
             # - Если диалог закрыт через крестик или отменён, просто выходим
-            if not self.file_name_with_substance:
+            if not file_name:
                 return
-            # Чтение данных
-            with open(self.file_name_with_substance) as file:
-                self.lines_file_with_gas = file.readlines()
+            spectrum_file = None
         # - Если файл не прочитан - скип
-        if not self.lines_file_with_gas:
+        elif not spectrum_file:
+            return
+        # 2. Чтение (файл отображается в память) и подготовка данных в фоновом потоке
+        self.run_in_background(
+            "Чтение спектра с веществом...",
+            partial(
+                read_and_prepare_spectrum,
+                file_name=file_name,
+                spectrum_file=spectrum_file,
+                frequency_range=self.get_selected_frequency_range(),
+                prepare=prepare_spectrum_with_substance,
+            ),
+            partial(self.apply_spectrum_with_substance, file_name),
+        )
+
+    def apply_spectrum_with_substance(self, file_name: str, loaded: tuple[SpectrumFile, tuple | None]):
+        """Сохранение и построение подготовленного сигнала с веществом (в потоке интерфейса)"""
+        self.file_name_with_substance = file_name
+        self.spectrum_file_with_gas, prepared = loaded
+        # - Если файл не прочитан - скип
+        if prepared is None:
             return
-        # 2. В зависимости от режима - парсим
-        if self.radioButton_selected_range.isChecked():
-            # Запрашиваем начало и конец диапазона спектра, из UI с валидацией
-            start_frequency, end_frequency = self.get_spectrum_frequency_range()
-            # Парс данных в заданных частотах
-            frequency, gamma = parser(self.lines_file_with_gas, start_frequency, end_frequency)
-        else:
-            # Парс данных
-            frequency, gamma = parser_all_data(self.lines_file_with_gas)
         # 3. Сохраняем данных
-        self.data.set_spectrum_with_substance(frequency, gamma)
+        self.data.apply_spectrum_with_substance(*prepared)
         # 4. Отображаем данные на графике
         self.update_graphics()
         # - Сохранение директории для следующего открытия диалога
         settings.setValue("last_with_substance_dir", os.path.dirname(self.file_name_with_substance))
 
+    def get_selected_frequency_range(self) -> tuple[float, float] | None:
+        """Диапазон частот для чтения: из UI с валидацией в режиме 'выбранный диапазон', иначе None (все данные)"""
+        if self.radioButton_selected_range.isChecked():
+            return self.get_spectrum_frequency_range()
+        return None
+
     def change_spectrum_range(self):
         """Вызов при обновлении диапазона спектра - Очищает, отображает данные в актуальном диапазоне"""
         spectra = self.data.get_spectra()
-        update_with_gas = not (spectra["with_gas"].empty or spectra["with_gas"].isna().all())
-        update_without_gas = not (spectra["without_gas"].empty or spectra["without_gas"].isna().all())
+        # Спектры перечитываются из уже открытых файлов
+        spectrum_file_with_gas = self.spectrum_file_with_gas
+        if not spectra.has_with_gas or not spectrum_file_with_gas:
+            spectrum_file_with_gas = None
+        spectrum_file_without_gas = self.spectrum_file_without_gas
+        if not spectra.has_without_gas or not spectrum_file_without_gas:
+            spectrum_file_without_gas = None
+        frequency_range = self.get_selected_frequency_range()
+
+        def read_spectra(task: BackgroundTask) -> tuple[tuple | None, tuple | None]:
+            with_gas = without_gas = None
+            if spectrum_file_with_gas is not None:
+                with_gas = read_and_prepare_spectrum(
+                    task, None, spectrum_file_with_gas, frequency_range, prepare_spectrum_with_substance
+                )
+            if spectrum_file_without_gas is not None:
+                without_gas = read_and_prepare_spectrum(
+                    task, None, spectrum_file_without_gas, frequency_range, prepare_spectrum_without_substance
+                )
+            return with_gas, without_gas
+
+        self.run_in_background("Чтение спектров в диапазоне...", read_spectra, self.apply_spectrum_range)
+
+    def apply_spectrum_range(self, loaded: tuple[tuple | None, tuple | None]):
+        """Замена спектров данными в актуальном диапазоне (в потоке интерфейса)"""
+        with_gas, without_gas = loaded
         self.data.clear_data()
-        if update_with_gas:
-            self.reading_and_plotting_data_with_substance(True)
-        if update_without_gas:
-            self.reading_and_plotting_data_without_substance(True)
+        if with_gas is not None:
+            self.apply_spectrum_with_substance(self.file_name_with_substance, with_gas)
+        if without_gas is not None:
+            self.apply_spectrum_without_substance(self.file_name_without_substance, without_gas)
         self.table()
 
     def reset_spectrum_data(self):
@@ -197,13 +305,65 @@ class GuiProgram(CustomDialog):
 
     def processing(self):
         """Поиск линий поглощения"""
-        spectra = self.data.get_spectra()
-        if spectra["with_gas"].empty or spectra["with_gas"].isna().all():
+        if not self.data.get_spectra().has_with_gas:
             raise AppException("""Ошибка при "Вычислении" """, """Нет данных с веществом """)
         if not self.data.get_neural_network():
             raise AppException("""Ошибка при "Вычислении" """, """Нет нейронной сети """)
-        # обработка
-        self.data.processing()
+        # обработка в фоновом потоке, результат записывается в потоке интерфейса
+        self.run_in_background(
+            "Поиск линий поглощения...",
+            lambda task: self.data.compute_absorption(progress=task.report_progress),
+            self.data.apply_absorption,
+        )
+
+    # ---------------------------------------------------------------------------
+    #   Фоновые задачи
+    # ---------------------------------------------------------------------------
+    def run_in_background(
+        self, label_text: str, function: Callable[[BackgroundTask], object], on_finished: Callable[[object], None]
+    ):
+        """
+        Выполняет function(task) в пуле потоков, показывая окно прогресса с кнопкой отмены.
+
+        Результат передается в on_finished в потоке интерфейса. Ошибка задачи пробрасывается в потоке интерфейса,
+        где ее показывает обработчик исключений приложения. Одновременно выполняется одна задача.
+        """
+        if self.background_task is not None:
+            raise AppException("Операция выполняется", "Дождитесь завершения текущей операции или отмените ее.")
+        task = BackgroundTask(function)
+        self.background_task = task
+        # Окно прогресса (модальное) появляется, если задача выполняется дольше PROGRESS_DIALOG_DELAY_MS
+        progress_dialog = QProgressDialog(label_text, "Отмена", 0, 0, self)
+        progress_dialog.setWindowTitle(setting.APPLICATION)
+        progress_dialog.setWindowModality(Qt.WindowModality.WindowModal)
+        progress_dialog.setMinimumDuration(PROGRESS_DIALOG_DELAY_MS)
+        progress_dialog.setAutoReset(False)
+        progress_dialog.canceled.connect(task.cancel)
+
+        def update_progress(done: int, total: int):
+            # total = 0 - объем неизвестен (индикатор занятости)
+            progress_dialog.setMaximum(total)
+            progress_dialog.setValue(done)
+
+        def close():
+            self.background_task = None
+            progress_dialog.canceled.disconnect(task.cancel)
+            progress_dialog.reset()
+            progress_dialog.deleteLater()
+
+        def finished(result):
+            close()
+            on_finished(result)
+
+        def failed(error: Exception):
+            close()
+            raise error
+
+        task.signals.progress.connect(update_progress)
+        task.signals.finished.connect(finished)
+        task.signals.failed.connect(failed)
+        task.signals.cancelled.connect(close)
+        self.thread_pool.start(task)
 
     # ---------------------------------------------------------------------------
     #   Методы для работы с графиком
@@ -216,125 +376,71 @@ class GuiProgram(CustomDialog):
         """Обработчик клика по точкам поглощения"""
         for point in points:
             x, y = point.pos()
-            # Получаем текущий статус
-            index, status, source_neural_network = self.data.get_status_point_absorption(x, y)
+            # Получаем индекс точки
+            index, _, _ = self.data.get_status_point_absorption(x, y)
             if index is None:
                 return
-            # Если точку поставили в ручную - удаляем
-            if not source_neural_network:
-                self.data.del_point_absorption_by_index(index)
-                return
-            # Если точку от нейронной сети - определяем новый статус и цвет
-            if status is None:
-                new_status = True
-            elif status:
-                new_status = False
-            else:
-                new_status = None
-            # Обновляем статус в данных
-            self.data.set_status_point_absorption_by_index(index, new_status)
+            self.toggle_point_absorption(index)
 
-    def with_gas_point_handler(self, widget: SpectrometerPlotWidget, plot, points):
-        """Обработчик клика по точкам 'with_gas'."""
-        for point in points:
-            x, y = point.pos()
-            # Проверяем, есть ли точка в точках поглощения
-            index, _, _ = self.data.get_status_point_absorption(x, y)
-            # Точки нет – добавляем
-            if index is None:
-                self.data.add_new_point_absorption(x, y)
+    def toggle_point_absorption(self, index: int):
+        """
+        Клик по точке поглощения (на графике или в таблице).
+
+        Точку, поставленную вручную, удаляет; у точки нейронной сети меняет статус по кругу
+        'под вопросом' -> 'подтверждена' -> 'отклонена' -> 'под вопросом'.
+        """
+        point_absorption = self.data.get_point_absorption()
+        # Если точку поставили в ручную - удаляем
+        if not point_absorption.source_neural_network[index]:
+            self.data.del_point_absorption_by_index(index)
+            return
+        # Если точку от нейронной сети - определяем новый статус
+        status = point_absorption.get_status(index)
+        if status is None:
+            new_status = True
+        elif status:
+            new_status = False
+        else:
+            new_status = None
+        # Обновляем статус в данных
+        self.data.set_status_point_absorption_by_index(index, new_status)
+
+    def with_gas_point_handler(self, widget: SpectrometerPlotWidget, x: float, y: float):
+        """Обработчик клика по точке 'with_gas' (отсчет спектра с частотой x и значением y)."""
+        # Проверяем, есть ли точка в точках поглощения
+        index, _, _ = self.data.get_status_point_absorption(x, y)
+        # Точки нет – добавляем
+        if index is None:
+            self.data.add_new_point_absorption(x, y)
 
     # ---------------------------------------------------------------------------
     #   Методы для работы с таблицей
     # ---------------------------------------------------------------------------
     def initialize_table(self):
-        """Инициализация: Пустая таблица"""
-        self.tableWidget_frequency_absorption.clear()
-        self.tableWidget_frequency_absorption.setColumnCount(4)
-        self.tableWidget_frequency_absorption.setHorizontalHeaderLabels(["Частота МГц", "Гамма", ""])
-        self.tableWidget_frequency_absorption.setColumnHidden(3, True)  # Скрываем столбец с индексом
-        self.tableWidget_frequency_absorption.resizeColumnToContents(2)
+        """Инициализация: таблица над моделью точек поглощения"""
+        table = self.tableView_frequency_absorption
+        table.setModel(self.absorption_table_proxy)
+        table.setItemDelegateForColumn(COLUMN_STATUS, self.absorption_status_delegate)
+        # Строки одной высоты - представление не измеряет содержимое строк
+        table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        table.verticalHeader().setDefaultSectionSize(26)
+        table.setColumnWidth(COLUMN_STATUS, 30)  # Ширина столбца со статусом
 
     def table(self):
-        """Отобразить точки поглощения в таблице с фильтрацией и форматированием."""
-        # Получаем данные точек поглощения
-        point_absorption = self.data.get_point_absorption()
-        if point_absorption.empty:
-            # Если данных нет - очищаем таблицу
-            self.tableWidget_frequency_absorption.setRowCount(0)
-            return
+        """Перестроить отображение точек поглощения в таблице (после замены точек)."""
+        self.absorption_table_model.apply_change(ABSORPTION_RESET)
 
-        # Устанавливаем начальное количество строк
-        self.tableWidget_frequency_absorption.setRowCount(len(point_absorption))
-
-        # Получаем текущий выбранный фильтр
-        filter_index = self.comboBox_select_table_view.currentIndex()
-
-        # Счетчик видимых строк
-        visible_row = 0
-
-        # Обрабатываем каждую строку данных
-        for frequency, gamma, status, source, index in zip(
-            point_absorption["frequency"],
-            point_absorption["gamma"],
-            point_absorption["status"],
-            point_absorption["source_neural_network"],
-            point_absorption.index.to_list(),
-        ):
-            # Применяем фильтр отображения
-            # - Все
-            if filter_index == 0:  # Все
-                pass
-            # - Под вопросом
-            elif filter_index == 1 and status is None:
-                pass
-            # - Отклоненные
-            elif filter_index == 2 and status is False:
-                pass
-            # - Подтвержденные
-            elif filter_index == 3 and status is True and source:
-                pass
-            # - Добавленные вручную
-            elif filter_index == 4 and status is True and not source:
-                pass
-            else:
-                continue
-
-            # Заполняем ячейки частоты, гаммы, индекса
-            self.tableWidget_frequency_absorption.setItem(visible_row, 0, QTableWidgetItem(f"{frequency:.3f}"))
-            self.tableWidget_frequency_absorption.setItem(visible_row, 1, QTableWidgetItem(f"{gamma:.7E}"))
-            self.tableWidget_frequency_absorption.setItem(visible_row, 3, QTableWidgetItem(str(index)))
-            # Создаем и настраиваем чекбокс для столбца статуса
-            checkbox_class = GreenRedYellowCheckBox if source else BlueRedYellowCheckBox
-            check_box = checkbox_class(initial_state=status, icon_size=22, allow_none=source)
-            check_box.clicked.connect(partial(self.frequency_selection, check_box, index, source))
-            self.tableWidget_frequency_absorption.setCellWidget(visible_row, 2, check_box)
-            # Устанавливаем высоту текущей строки
-            self.tableWidget_frequency_absorption.setRowHeight(visible_row, 26)
-            visible_row += 1
-
-        # Устанавливаем окончательное количество видимых строк
-        self.tableWidget_frequency_absorption.setRowCount(visible_row)
-
-        # Настраиваем внешний вид таблицы
-        self.tableWidget_frequency_absorption.setColumnWidth(2, 30)  # Ширина столбца с чекбоксом
-
-    def frequency_selection(self, sender: GreenRedYellowCheckBox | BlueRedYellowCheckBox, index, source, checked):
-        """Клик по чекбоксу в таблице"""
+    def frequency_selection(self, index: QModelIndex):
+        """Клик по статусу точки в таблице"""
         # Нет точек поглощения - сброс
         if self.data.get_point_absorption().empty:
             return
-        # Точка от нейронной сети -> меняем состояние в данных и обновляем график
-        if source:
-            self.data.set_status_point_absorption_by_index(index, sender.state)
-        # Точка поставленная руками -> удаляем из данных, обновляем график
-        else:
-            self.data.del_point_absorption_by_index(index)
+        self.toggle_point_absorption(self.absorption_table_proxy.mapToSource(index).row())
 
-    def get_clicked_cell(self, row):
+    def get_clicked_cell(self, index: QModelIndex):
         """Клик по строке таблице - zoom к указанной области графика или к зоне с линиями поглощения"""
-        # Нет исходных данных - сброс
-        if self.data.get_spectra().empty:
+        # Нет исходных данных или клик по статусу (обрабатывается frequency_selection) - сброс
+        if self.data.get_spectra().empty or index.column() == COLUMN_STATUS:
             return
         # Получаем необходимые данные
         # * Спектр
@@ -342,26 +448,23 @@ class GuiProgram(CustomDialog):
         # * Точки поглощения
         point_absorption = self.data.get_point_absorption()
         # * Индекс точки к которой необходим zoom
-        index_data = int(self.tableWidget_frequency_absorption.item(row, 3).text())
+        index_data = self.absorption_table_proxy.mapToSource(index).row()
         # * Ширина окна просмотра
         window_width: float = self.get_window_width()
         frequency_left_or_right = window_width / 2
 
         # Находим границы области
         # * По x
-        frequency_peak = point_absorption["frequency"].loc[index_data]
+        frequency_peak = point_absorption.frequency[index_data]
         x_min = frequency_peak - frequency_left_or_right
         x_max = frequency_peak + frequency_left_or_right
-        # * По y
-        mask = spectra["frequency"].between(x_min, x_max)
-        y_values = spectra["with_gas"][mask]
-        if not y_values.empty:
-            y_min = y_values.min()
-            y_max = y_values.max()
+        # * По y (по пирамиде min/max спектра, без прохода по отсчетам)
+        pyramid = spectra.pyramid("with_gas")
+        extent = pyramid.extent(x_min, x_max)
         # Если данных в диапазоне нет, берем общий min/max для "with_gas"
-        else:
-            y_min = spectra["with_gas"].min()
-            y_max = spectra["with_gas"].max()
+        if extent is None:
+            extent = pyramid.extent(-np.inf, np.inf)
+        y_min, y_max = extent
 
         # zoom
         self.plot_widget_1.plot_widget.zoom_to_region(x_min=x_min, x_max=x_max, y_min=y_min, y_max=y_max)
@@ -378,8 +481,7 @@ class GuiProgram(CustomDialog):
         # Загружаем последнюю успешную директорию, если она есть, иначе используем текущую (".")
         last_dir = settings.value("result_dir", ".", type=str)
         # - Формируем имя файла и добавляем путь
-        base_name = os.path.splitext(os.path.basename(self.file_name_with_substance))[0]
-        recommended_file_name = os.path.join(last_dir, f"Result_for_{base_name}")
+        recommended_file_name = get_result_file_name(self.file_name_with_substance, last_dir)
         # - Загрузка
         file_name, _ = QFileDialog.getSaveFileName(
             self, "Сохранение", recommended_file_name, "Text(*.txt);;Spectrometer Data(*.csv);;All Files(*)"
@@ -390,26 +492,7 @@ class GuiProgram(CustomDialog):
 
         # Запись
         try:
-            with open(file_name, "w", encoding="utf-8") as file:
-                # Заголовок
-                file.write("FREQUENCY:\tGAMMA:\tSOURCE_NEURAL_NETWORK:\n")
-                # Запись только подтвержденных данных (status=True)
-                filtered_data = point_absorption[point_absorption["status"] == True]
-                for row in filtered_data[["frequency", "gamma", "source_neural_network"]].itertuples(index=False):
-                    file.write(f"{row.frequency}\t{row.gamma}\t{row.source_neural_network}\n")
-                # Разделитель и статистика
-                file.write("***********************************************************\n")
-                nn_data = point_absorption[point_absorption["source_neural_network"] == True]
-                stats = {
-                    "RESULTS_FORMATTER_VERSION": setting.RESULTS_FORMATTER_VERSION,
-                    "Обнаружено": nn_data.shape[0],
-                    "Подтверждено": nn_data[nn_data["status"] == True].shape[0],
-                    "Отклонено": nn_data[nn_data["status"] == False].shape[0],
-                    "Непроверенно": nn_data[nn_data["status"].isna()].shape[0],
-                    "Добавлено вручную": point_absorption[point_absorption["source_neural_network"] == False].shape[0],
-                    "Всего": point_absorption.shape[0],
-                }
-                file.write("\n".join(f"{key}: {value}" for key, value in stats.items()) + "\n")
+            write_result_file(file_name, point_absorption)
             # Сохраняем директорию выбранного файла как последнюю успешную
             settings.setValue("result_dir", os.path.dirname(file_name))
         except IOError as e:
@@ -431,19 +514,13 @@ class GuiProgram(CustomDialog):
             return
 
         try:
-            with open(file_name, "r", encoding="utf-8") as file:
-                data = [
-                    (float(freq), float(gam), src.lower() == "true")
-                    for line in file
-                    if "\t" in line and not line.startswith(("FREQ", "*"))
-                    for freq, gam, src in [line.strip().split("\t")]
-                ]
-                if not data:
-                    raise AppException("Ошибка чтения", "Нет данных точек поглощения")
-
-                freq, gamma, src_nn = zip(*data)
-                self.data.set_point_absorption(freq, gamma, [True] * len(freq), src_nn)
-                settings.setValue("result_dir", os.path.dirname(file_name))
+            data = read_result_file(file_name)
+            if not data:
+                raise AppException("Ошибка чтения", "Нет данных точек поглощения")
+
+            freq, gamma, src_nn = zip(*data)
+            self.data.set_point_absorption(freq, gamma, [True] * len(freq), src_nn)
+            settings.setValue("result_dir", os.path.dirname(file_name))
 
         except (IOError, ValueError) as error:
             raise AppException("Ошибка файла", str(error))
@@ -457,18 +534,17 @@ class GuiProgram(CustomDialog):
         if point_absorption.empty:
             return
 
-        # Фильтр строк, где source_neural_network=True
-        filtered_neuron_found = point_absorption[point_absorption["source_neural_network"] == True]
+        # Точки подтвержденные (status=True) и найденные нейронной сетью (source_neural_network=True)
+        confirmed = point_absorption.status == STATUS_CONFIRMED
+        source_neural_network = point_absorption.source_neural_network
         # Количество строк, где source_neural_network=True
-        points_neuron_found = filtered_neuron_found.shape[0]
+        points_neuron_found = int(np.count_nonzero(source_neural_network))
         # Количество строк, где source_neural_network=True и status=True
-        points_confirmed = filtered_neuron_found[filtered_neuron_found["status"] == True].shape[0]
+        points_confirmed = int(np.count_nonzero(confirmed & source_neural_network))
         # Процент выбранных
         percent_chosen = 0 if points_neuron_found == 0 else points_confirmed / points_neuron_found
-        # Фильтр строк, где status=True
-        filtered_absorption_lines = point_absorption[point_absorption["status"] == True]
         # Всего найденных частот поглощения
-        number_absorption_lines = filtered_absorption_lines.shape[0]
+        number_absorption_lines = int(np.count_nonzero(confirmed))
         # Строки статистики
         text_statistics = (
             f"Одобрено {points_confirmed} из {points_neuron_found} ( {percent_chosen:.2%} ) \n"
@@ -480,8 +556,8 @@ class GuiProgram(CustomDialog):
     # ---------------------------------------------------------------------------
     #   Методы вызываемый при обновлении частот поглощения
     # ---------------------------------------------------------------------------
-    def update_ui_on_absorption_change(self, *args, **kwargs):
-        """Метод вызываемый при обновлении частот поглощения."""
-        self.table()
-        self.update_graphics()
+    def update_ui_on_absorption_change(self, *args, change: AbsorptionChange = ABSORPTION_RESET, **kwargs):
+        """Метод вызываемый при обновлении частот поглощения: обновляет только затронутые строки и точки."""
+        self.absorption_table_model.apply_change(change)
+        self.plot_widget_1.plot_widget.update_absorption_points(self.data, change)
         self.update_statistics()
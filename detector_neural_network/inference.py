@@ -0,0 +1,156 @@
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import pairwise
+
+import numpy as np
+from sklearn.neural_network import MLPClassifier
+
+from detector_neural_network import setting
+from detector_neural_network.mlp_engine import MlpInferenceEngine
+from detector_neural_network.windowing import count_windows, iter_window_batches
+
+# Байт на одно значение float64
+FLOAT_SIZE = np.dtype(np.float64).itemsize
+# Исполнители для параллельной обработки частей окон
+EXECUTORS = ("thread", "process")
+
+# Модель, загруженная в процесс-исполнитель один раз при его запуске
+_process_neural_network: MLPClassifier | None = None
+_process_engine: MlpInferenceEngine | None = None
+
+
+def estimate_batch_size(neural_network: MLPClassifier, memory_budget_mb: float) -> int:
+    """
+    Размер пакета окон, при котором промежуточные массивы прямого прохода укладываются в бюджет памяти.
+
+    На одно окно приходится копия входа (окна - представление, для матричного умножения копируются) и матрицы
+    активаций всех слоев.
+    """
+    hidden_layer_sizes = np.atleast_1d(neural_network.hidden_layer_sizes)
+    values_per_window = 2 * neural_network.n_features_in_ + int(hidden_layer_sizes.sum()) + neural_network.n_outputs_
+    return max(int(memory_budget_mb * 2**20 // (values_per_window * FLOAT_SIZE)), 1)
+
+
+def get_batch_size(neural_network: MLPClassifier, batch_size: int | None = None, workers: int = 1) -> int:
+    """
+    Размер пакета: явно заданный, из setting.INFERENCE_BATCH_SIZE или по бюджету памяти.
+
+    При параллельной обработке бюджет памяти делится между workers исполнителями.
+    """
+    if batch_size:
+        return batch_size
+    if setting.INFERENCE_BATCH_SIZE:
+        return setting.INFERENCE_BATCH_SIZE
+    return estimate_batch_size(neural_network, setting.INFERENCE_MEMORY_BUDGET_MB / workers)
+
+
+def predict_windows(
+    neural_network: MLPClassifier,
+    values: np.ndarray,
+    window_width: int,
+    batch_size: int | None = None,
+    engine: MlpInferenceEngine | None = None,
+    progress: Callable[[int, int], None] | None = None,
+) -> np.ndarray:
+    """
+    Предсказание нейронной сети для всех окон массива, пакетами ограниченного размера.
+
+    Результат совпадает с neural_network.predict(sliding_windows(values, window_width)).
+
+    :param neural_network: Обученный классификатор.
+    :param values: Масштабированный массив значений.
+    :param window_width: Ширина окна (количество входов сети).
+    :param batch_size: Количество окон в пакете (None - см. get_batch_size).
+    :param engine: Прямой проход на numpy, извлеченный из neural_network (None - predict sklearn).
+    :param progress: Функция, вызываемая после каждого пакета (обработано окон, всего окон).
+    :return: Предсказания для каждого окна.
+    """
+    batch_size = get_batch_size(neural_network, batch_size)
+    predict = neural_network.predict if engine is None else engine.predict
+    result = np.empty(count_windows(len(values), window_width), dtype=neural_network.classes_.dtype)
+    start = 0
+    for batch in iter_window_batches(values, window_width, batch_size):
+        result[start : start + len(batch)] = predict(batch)
+        start += len(batch)
+        if progress is not None:
+            progress(start, len(result))
+    return result
+
+
+def split_into_shards(total: int, shards: int) -> list[tuple[int, int]]:
+    """Делит диапазон [0, total) на shards непрерывных частей почти равного размера."""
+    bounds = np.linspace(0, total, min(shards, total) + 1).astype(int)
+    return list(pairwise(bounds))
+
+
+def _init_process_worker(neural_network: MLPClassifier, use_engine: bool) -> None:
+    """Инициализатор процесса-исполнителя: модель передается и подготавливается один раз на процесс."""
+    global _process_neural_network, _process_engine
+    _process_neural_network = neural_network
+    _process_engine = MlpInferenceEngine(neural_network, setting.INFERENCE_DTYPE) if use_engine else None
+
+
+def _predict_shard_in_process(values: np.ndarray, window_width: int, batch_size: int) -> np.ndarray:
+    return predict_windows(_process_neural_network, values, window_width, batch_size, _process_engine)
+
+
+def predict_windows_parallel(
+    neural_network: MLPClassifier,
+    values: np.ndarray,
+    window_width: int,
+    workers: int | None = None,
+    executor: str | None = None,
+    batch_size: int | None = None,
+    engine: MlpInferenceEngine | None = None,
+    progress: Callable[[int, int], None] | None = None,
+) -> np.ndarray:
+    """
+    Предсказание нейронной сети для всех окон, разделенных на части (shards) по числу исполнителей.
+
+    Каждая часть - непрерывный диапазон окон со своим участком массива (с перекрытием window_width - 1).
+    Части обрабатываются в пуле потоков (numpy отпускает GIL при матричном умножении) или процессов, результаты
+    собираются по порядку и совпадают с последовательным predict_windows.
+
+    :param workers: Количество исполнителей (None - setting.INFERENCE_WORKERS). 1 - последовательная обработка.
+    :param executor: "thread" или "process" (None - setting.INFERENCE_EXECUTOR).
+    :param progress: Функция прогресса (обработано окон, всего окон), при параллельной обработке - по частям.
+        Исключение из нее отменяет еще не начатые части.
+    :return: Предсказания для каждого окна.
+    """
+    workers = workers or setting.INFERENCE_WORKERS
+    executor = executor or setting.INFERENCE_EXECUTOR
+    if executor not in EXECUTORS:
+        raise ValueError(f"Неизвестный исполнитель {executor!r}, допустимо: {', '.join(EXECUTORS)}")
+    total = count_windows(len(values), window_width)
+    if workers <= 1 or total < 2:
+        return predict_windows(neural_network, values, window_width, batch_size, engine, progress)
+
+    batch_size = get_batch_size(neural_network, batch_size, workers)
+    shards = split_into_shards(total, workers)
+    pool: Executor
+    if executor == "process":
+        pool = ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_process_worker, initargs=(neural_network, engine is not None)
+        )
+    else:
+        pool = ThreadPoolExecutor(max_workers=workers)
+    with pool:
+        futures = []
+        for start, stop in shards:
+            shard = values[start : stop + window_width - 1]
+            if executor == "process":
+                futures.append(pool.submit(_predict_shard_in_process, shard, window_width, batch_size))
+            else:
+                futures.append(pool.submit(predict_windows, neural_network, shard, window_width, batch_size, engine))
+        # Сборка результатов по порядку частей
+        result = np.empty(total, dtype=neural_network.classes_.dtype)
+        try:
+            for (start, stop), future in zip(shards, futures):
+                result[start:stop] = future.result()
+                if progress is not None:
+                    progress(stop, total)
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+    return result
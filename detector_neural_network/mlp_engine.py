@@ -0,0 +1,86 @@
+import numpy as np
+from scipy.special import expit
+from sklearn.neural_network import MLPClassifier
+
+# Допуск вероятностей выходного слоя при вычислении в float32 (относительно sklearn в float64).
+# Классы совпадают со sklearn везде, кроме окон с вероятностью в пределах допуска от порога 0.5.
+FLOAT32_TOLERANCE = 1e-4
+
+
+def relu(values: np.ndarray) -> None:
+    np.maximum(values, 0, out=values)
+
+
+def logistic(values: np.ndarray) -> None:
+    expit(values, out=values)
+
+
+def tanh(values: np.ndarray) -> None:
+    np.tanh(values, out=values)
+
+
+def identity(values: np.ndarray) -> None:
+    pass
+
+
+def softmax(values: np.ndarray) -> None:
+    shifted = values - values.max(axis=1)[:, np.newaxis]
+    np.exp(shifted, out=values)
+    values /= values.sum(axis=1)[:, np.newaxis]
+
+
+# Функции активации (на месте), как в sklearn.neural_network
+ACTIVATIONS = {"relu": relu, "logistic": logistic, "tanh": tanh, "identity": identity, "softmax": softmax}
+
+
+class MlpInferenceEngine:
+    """
+    Прямой проход многослойного перцептрона на numpy без проверок входа sklearn.
+
+    Веса и смещения извлекаются из обученного MLPClassifier один раз и хранятся непрерывными массивами в раскладке
+    (входы, выходы), которую матричное умножение X @ W использует без преобразований. Каждый слой - умножение
+    в выделенный буфер, прибавление смещения и активация на месте.
+    В float64 результат совпадает с MLPClassifier.predict побитово (тот же порядок операций), в float32 вероятности
+    отличаются не более чем на FLOAT32_TOLERANCE.
+    """
+
+    __slots__ = ("biases", "classes", "dtype", "hidden_activation", "n_features_in", "output_activation", "weights")
+
+    def __init__(self, neural_network: MLPClassifier, dtype: np.dtype | str = np.float64):
+        self.dtype: np.dtype = np.dtype(dtype)
+        self.weights: list[np.ndarray] = [
+            np.ascontiguousarray(coef, dtype=self.dtype) for coef in neural_network.coefs_
+        ]
+        self.biases: list[np.ndarray] = [
+            np.ascontiguousarray(intercept, dtype=self.dtype) for intercept in neural_network.intercepts_
+        ]
+        self.hidden_activation = ACTIVATIONS[neural_network.activation]
+        self.output_activation = ACTIVATIONS[neural_network.out_activation_]
+        self.classes: np.ndarray = neural_network.classes_
+        self.n_features_in: int = neural_network.n_features_in_
+
+    def predict_proba_raw(self, inputs: np.ndarray) -> np.ndarray:
+        """Выход последнего слоя (после выходной активации) для пакета входов формы (n, n_features_in)."""
+        activation = inputs if inputs.dtype == self.dtype else inputs.astype(self.dtype)
+        last_layer = len(self.weights) - 1
+        for layer, (weight, bias) in enumerate(zip(self.weights, self.biases)):
+            output = np.empty((activation.shape[0], weight.shape[1]), dtype=self.dtype)
+            np.matmul(activation, weight, out=output)
+            output += bias
+            if layer != last_layer:
+                self.hidden_activation(output)
+            activation = output
+        self.output_activation(activation)
+        return activation
+
+    def predict(self, inputs: np.ndarray) -> np.ndarray:
+        """Классы для пакета входов, как MLPClassifier.predict."""
+        output = self.predict_proba_raw(inputs)
+        # Многоклассовая классификация - класс с максимальной вероятностью
+        if self.output_activation is softmax:
+            return self.classes[output.argmax(axis=1)]
+        # Бинарная классификация - порог 0.5 (как LabelBinarizer.inverse_transform)
+        if output.shape[1] == 1:
+            return self.classes[(output.ravel() > 0.5).astype(np.intp)]
+        # Многометочная классификация - матрица индикаторов
+        return (output > 0.5).astype(int)
@@ -9,9 +9,21 @@ from pyqtgraph.Qt.QtWidgets import (
     QWidget,
 )
 
+# Иконки статусов (ресурсы приложения)
+ICON_PATH_NO = ":/multi_check_box/resource/multi_check_box_svg/no_24dp.svg"
+ICON_PATH_UNDEFINED = ":/multi_check_box/resource/multi_check_box_svg/undefined_24dp.svg"
+ICON_PATH_YES_GREEN = ":/multi_check_box/resource/multi_check_box_svg/yes_green_24dp.svg"
+ICON_PATH_YES_BLUE = ":/multi_check_box/resource/multi_check_box_svg/yes_blue_24dp.svg"
 
-def load_svg_icon(svg_path, size=24):
-    pixmap = QPixmap(size, size)
+
+# Общий кэш иконок процесса: (путь, размер, плотность пикселей) -> QPixmap
+_svg_icon_cache: dict[tuple[str, int, float], QPixmap] = {}
+
+
+def load_svg_icon(svg_path, size=24, device_pixel_ratio=1.0):
+    """Растеризует SVG в QPixmap логического размера size (с учетом плотности пикселей экрана)."""
+    physical_size = round(size * device_pixel_ratio)
+    pixmap = QPixmap(physical_size, physical_size)
     pixmap.fill(Qt.GlobalColor.transparent)
 
     renderer = QtSvg.QSvgRenderer(svg_path)
@@ -19,6 +31,23 @@ def load_svg_icon(svg_path, size=24):
     renderer.render(painter)
     painter.end()
 
+    pixmap.setDevicePixelRatio(device_pixel_ratio)
+    return pixmap
+
+
+def get_svg_icon(svg_path, size=24, device_pixel_ratio=None) -> QPixmap:
+    """
+    Иконка из общего кэша: SVG растеризуется один раз на путь, размер и плотность пикселей.
+
+    :param device_pixel_ratio: Плотность пикселей устройства отрисовки (None - основного экрана приложения).
+    """
+    if device_pixel_ratio is None:
+        application = QApplication.instance()
+        device_pixel_ratio = application.devicePixelRatio() if application is not None else 1.0
+    key = (svg_path, size, device_pixel_ratio)
+    pixmap = _svg_icon_cache.get(key)
+    if pixmap is None:
+        pixmap = _svg_icon_cache[key] = load_svg_icon(svg_path, size, device_pixel_ratio)
     return pixmap
 
 
@@ -78,9 +107,9 @@ class GreenRedYellowCheckBox(BaseMultiCheckBox):
         super().__init__(initial_state, icon_size, allow_none)  # Сначала вызываем базовый конструктор
         # определяем иконки разных статусов, через ресурсы приложения
         self.icon_status = {
-            False: load_svg_icon(":/multi_check_box/resource/multi_check_box_svg/no_24dp.svg", icon_size),
-            None: load_svg_icon(":/multi_check_box/resource/multi_check_box_svg/undefined_24dp.svg", icon_size),
-            True: load_svg_icon(":/multi_check_box/resource/multi_check_box_svg/yes_green_24dp.svg", icon_size),
+            False: get_svg_icon(ICON_PATH_NO, icon_size),
+            None: get_svg_icon(ICON_PATH_UNDEFINED, icon_size),
+            True: get_svg_icon(ICON_PATH_YES_GREEN, icon_size),
         }
         self.set_initial_pixmap()
 
@@ -95,9 +124,9 @@ class BlueRedYellowCheckBox(BaseMultiCheckBox):
         super().__init__(initial_state, icon_size, allow_none)  # Сначала вызываем базовый конструктор
         # определяем иконки разных статусов, через ресурсы приложения
         self.icon_status = {
-            False: load_svg_icon(":/multi_check_box/resource/multi_check_box_svg/no_24dp.svg", icon_size),
-            None: load_svg_icon(":/multi_check_box/resource/multi_check_box_svg/undefined_24dp.svg", icon_size),
-            True: load_svg_icon(":/multi_check_box/resource/multi_check_box_svg/yes_blue_24dp.svg", icon_size),
+            False: get_svg_icon(ICON_PATH_NO, icon_size),
+            None: get_svg_icon(ICON_PATH_UNDEFINED, icon_size),
+            True: get_svg_icon(ICON_PATH_YES_BLUE, icon_size),
         }
         self.set_initial_pixmap()
 
@@ -1,52 +0,0 @@
-# Входной список, парсит по столбцам
-def parser_all_data(string_list):
-    frequency_list = list()
-    gamma_list = list()
-
-    skipping_first_line = True  # Пропускаем первую строку?
-
-    for line in string_list:
-        # Пропуск первой строки
-        if skipping_first_line:
-            skipping_first_line = False
-            continue
-
-        # Если звездочки, конец файла
-        if line[0] == "*":
-            break
-
-        # Разделяем строку по пробелу в список
-        row = line.split()
-
-        frequency_list.append(float(row[1]))
-        gamma_list.append(float(row[4]))
-
-    return frequency_list, gamma_list
-
-
-# Входной список, парсит по столбцам, в заданных частотах
-def parser(string_list, start_frequency=None, end_frequency=None):
-    frequency_list = list()
-    gamma_list = list()
-
-    skipping_first_line = True  # Пропускаем первую строку?
-
-    for line in string_list:
-        # Пропуск первой строки
-        if skipping_first_line:
-            skipping_first_line = False
-            continue
-
-        # Если звездочки, конец файла
-        if line[0] == "*":
-            break
-
-        # Разделяем строку по пробелу в список
-        row = line.split()
-
-        # Если частота в диапазоне частот берем
-        if start_frequency <= float(row[1]) <= end_frequency:
-            frequency_list.append(float(row[1]))
-            gamma_list.append(float(row[4]))
-
-    return frequency_list, gamma_list
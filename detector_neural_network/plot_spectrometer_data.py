@@ -1,9 +1,7 @@
 import sys
 
 import numpy as np
-import pandas as pd
-from pandas import DataFrame
-from pyqtgraph import PlotWidget, ScatterPlotItem, mkPen, setConfigOptions
+from pyqtgraph import PlotDataItem, PlotWidget, ScatterPlotItem, mkBrush, mkPen, setConfigOptions
 from pyqtgraph.Qt.QtCore import Qt, Signal
 from pyqtgraph.Qt.QtGui import QColor, QPixmap, QPainter
 from pyqtgraph.Qt.QtWidgets import (
@@ -14,7 +12,17 @@ from pyqtgraph.Qt.QtWidgets import (
     QWidget,
 )
 
+from detector_neural_network import setting
+from detector_neural_network.absorption_points import (
+    ABSORPTION_RESET,
+    CHANGE_STATUS,
+    STATUS_CONFIRMED,
+    STATUS_REJECTED,
+    STATUS_UNVERIFIED,
+    AbsorptionChange,
+)
 from detector_neural_network.data_and_processing import DataAndProcessing
+from detector_neural_network.spectrum_envelope import MinMaxPyramid, visible_slice
 
 
 def clearer_layout(layout):
@@ -37,6 +45,7 @@ class SpectrometerPlotWidget(PlotWidget):
     color_without_gas = "#515151"
     name_with_gas = "C веществом"
     color_with_gas = "#DC7C02"
+    with_gas_click_radius = 6  # Радиус попадания нажатия в отсчет спектра с веществом [пиксели]
     absorption_line_text_found_programmatically = "Линия поглощения (найдена программно)"
     absorption_line_colors_found_programmatically = {
         # Порядок цветов важен для absorption_line_choices
@@ -71,95 +80,171 @@ class SpectrometerPlotWidget(PlotWidget):
         self.absorption_click_callback = absorption_click_callback
         self.with_gas_click_callback = with_gas_click_callback
 
+        # Слои графика создаются один раз и обновляются на месте (setData / setBrush): при изменении данных
+        # перерисовывается только измененный слой
+        # - Спектр без вещества
+        self.without_gas_curve = PlotDataItem(
+            pen=mkPen(color=self.color_without_gas, width=2), name=self.name_without_gas
+        )
+        # - Спектр с веществом (нажатие на отсчет находится поиском ближайшего отсчета - find_with_gas_sample)
+        self.with_gas_curve = PlotDataItem(pen=mkPen(color=self.color_with_gas, width=2), name=self.name_with_gas)
+        # - Точки поглощения (кисти общие для всех точек одного цвета - без создания кисти на точку)
+        self.absorption_scatter = ScatterPlotItem(symbol="o", pen=mkPen("k"), size=8)
+        self.absorption_brushes = np.array([mkBrush(color) for color in self.absorption_line_choices], dtype=object)
+        for item in (self.without_gas_curve, self.with_gas_curve, self.absorption_scatter):
+            self.addItem(item)
+        # Подключаем callback если он задан
+        if self.with_gas_click_callback:
+            # Нажатие по графику (кроме точек поглощения) проверяется на попадание в отсчет
+            self.scene().sigMouseClicked.connect(self.with_gas_clicked)
+        if self.absorption_click_callback:
+            self.absorption_scatter.sigClicked.connect(
+                lambda plot, points: self.absorption_click_callback(self, plot, points)
+            )
+        # Данные текущей легенды (сигнал dataUpdated испускается при изменении состава слоев)
+        self.legend_data: list | None = None
+
+        # Уровень детализации спектров: кривые получают только огибающую видимого диапазона из пирамиды min/max
+        # спектра (MinMaxPyramid.envelope), которая пересчитывается при изменении области просмотра и размера графика
+        # - Пирамиды кривых спектров (полные данные) и параметры символов точек
+        empty_pyramid = MinMaxPyramid(np.empty(0), np.empty(0))
+        self.spectrum_layers: dict[PlotDataItem, tuple[MinMaxPyramid, dict]] = {
+            self.without_gas_curve: (
+                empty_pyramid,
+                {"symbol": "o", "symbolSize": 4, "symbolBrush": self.color_without_gas},
+            ),
+            self.with_gas_curve: (
+                empty_pyramid,
+                {"symbol": "o", "symbolSize": 5, "symbolPen": mkPen("k"), "symbolBrush": self.color_with_gas},
+            ),
+        }
+        # - Параметры последней отрисовки кривых (диапазон и ширина) - без пересчета при неизменной области
+        self.level_of_detail_keys: dict[PlotDataItem, tuple] = {}
+        view_box = self.getViewBox()
+        view_box.sigXRangeChanged.connect(self.update_level_of_detail)
+        view_box.sigResized.connect(self.update_level_of_detail)
+        # Включение автомасштаба не меняет область просмотра сразу - кривая должна получить все данные
+        view_box.sigStateChanged.connect(self.update_level_of_detail)
+
     def plot_spectrometer_data(self, data_obj: DataAndProcessing):
         """
         Метод для отрисовки данных со спектрометра, используя объект DataAndProcessing.
 
+        Обновляет все слои: спектры и точки поглощения.
+
         :param data_obj: Объект DataAndProcessing с данными для отрисовки.
         """
-        # Очищаем предыдущие данные
-        self.clear()
-        legend_data = []
+        self.update_spectra(data_obj)
+        self.update_absorption_points(data_obj, ABSORPTION_RESET)
 
-        # Извлекаем данные для отрисовки из data_obj
+    def update_spectra(self, data_obj: DataAndProcessing):
+        """Обновляет слои спектров без вещества и с веществом."""
         spectrometer_data = data_obj.get_spectra()
-        absorption_points = data_obj.get_point_absorption()
+        # Проверка на наличие данных "без вещества" и "с веществом" и их отрисовка (с уровнем детализации)
+        for item, column in ((self.without_gas_curve, "without_gas"), (self.with_gas_curve, "with_gas")):
+            visible = spectrometer_data.has(column)
+            pyramid = spectrometer_data.pyramid(column) if visible else MinMaxPyramid(np.empty(0), np.empty(0))
+            self.spectrum_layers[item] = (pyramid, self.spectrum_layers[item][1])
+            item.setVisible(visible)
+        self.level_of_detail_keys.clear()
+        self.update_level_of_detail()
+        self.update_legend(data_obj)
+
+    def update_level_of_detail(self, *args):
+        """
+        Передает кривым спектров данные видимого диапазона с прореживанием до огибающей min/max по пикселям.
 
-        # Проверка на наличие данных "без вещества" и их отрисовка
-        if (
-            isinstance(spectrometer_data, DataFrame)
-            and not spectrometer_data.empty
-            and "without_gas" in spectrometer_data.columns
-            and not spectrometer_data["frequency"].dropna().empty
-            and not spectrometer_data["without_gas"].dropna().empty
-        ):
-            self.plot(
-                spectrometer_data["frequency"],
-                spectrometer_data["without_gas"],
-                pen=mkPen(color=self.color_without_gas, width=2),
-                symbol="o",
-                symbolSize=4,
-                symbolBrush=self.color_without_gas,
-                name=self.name_without_gas,
-            )
-            legend_data.append((self.color_without_gas, self.name_without_gas))
+        При автомасштабе по частоте кривая получает весь спектр. Символы точек показываются, только если видимых
+        отсчетов на пиксель не больше setting.PLOT_SYMBOL_MAX_POINTS_PER_PIXEL.
+        """
+        view_box = self.getViewBox()
+        pixels = max(int(view_box.width()), 1)
+        auto_range = bool(view_box.autoRangeEnabled()[0])
+        for item, (pyramid, symbol_options) in self.spectrum_layers.items():
+            frequency = pyramid.frequency
+            # Диапазон отрисовки: область просмотра или весь спектр (автомасштаб, режим выключен, нет данных)
+            level_of_detail = setting.PLOT_LEVEL_OF_DETAIL and len(frequency) > 0
+            if level_of_detail and not auto_range:
+                x_min, x_max = view_box.viewRange()[0]
+            elif len(frequency):
+                x_min, x_max = frequency[0], frequency[-1]
+            else:
+                x_min, x_max = 0.0, 0.0
+            key = (x_min, x_max, pixels if level_of_detail else None)
+            if self.level_of_detail_keys.get(item) == key:
+                continue
+            self.level_of_detail_keys[item] = key
+            if not level_of_detail:
+                item.setData(x=frequency, y=pyramid.values, **symbol_options)
+                continue
+            x, y = pyramid.envelope(x_min, x_max, pixels)
+            visible = visible_slice(frequency, x_min, x_max)
+            points_per_pixel = (visible.stop - visible.start) / pixels
+            show_symbols = points_per_pixel <= setting.PLOT_SYMBOL_MAX_POINTS_PER_PIXEL
+            item.setData(x=x, y=y, **(symbol_options if show_symbols else {"symbol": None}))
+
+    def find_with_gas_sample(self, scene_position) -> int | None:
+        """
+        Индекс отсчета спектра с веществом, ближайшего к точке сцены, или None, если он дальше with_gas_click_radius.
 
-        # Проверка на наличие данных "с веществом" и их отрисовка
-        if (
-            isinstance(spectrometer_data, DataFrame)
-            and not spectrometer_data.empty
-            and "with_gas" in spectrometer_data.columns
-            and not spectrometer_data["frequency"].dropna().empty
-            and not spectrometer_data["with_gas"].dropna().empty
-        ):
-            # Рисуем линию
-            self.plot(
-                spectrometer_data["frequency"],
-                spectrometer_data["with_gas"],
-                pen=mkPen(color=self.color_with_gas, width=2),
-                name=self.name_with_gas,
-            )
-            # Добавляем точки поверх линии с обработкой нажатий
-            with_gas_scatter = ScatterPlotItem(
-                x=spectrometer_data["frequency"],
-                y=spectrometer_data["with_gas"],
-                symbol="o",
-                pen=mkPen("k"),
-                size=5,
-                brush=self.color_with_gas,
-            )
-            self.addItem(with_gas_scatter)
-            with_gas_scatter.sigClicked.connect(lambda plot, points: self.with_gas_click_callback(self, plot, points))
+        Кандидаты - отсчеты в полосе радиуса по частоте (двоичный поиск по частотам), расстояние до них
+        измеряется в пикселях графика.
+        """
+        pyramid, _ = self.spectrum_layers[self.with_gas_curve]
+        frequency, values = pyramid.frequency, pyramid.values
+        if not len(frequency) or not self.with_gas_curve.isVisible():
+            return None
+        view_box = self.getViewBox()
+        position = view_box.mapSceneToView(scene_position)
+        pixel_width, pixel_height = view_box.viewPixelSize()
+        if not pixel_width or not pixel_height:
+            return None
+        band = slice(
+            int(np.searchsorted(frequency, position.x() - self.with_gas_click_radius * pixel_width, side="left")),
+            int(np.searchsorted(frequency, position.x() + self.with_gas_click_radius * pixel_width, side="right")),
+        )
+        distance = np.hypot(
+            (frequency[band] - position.x()) / pixel_width, (values[band] - position.y()) / pixel_height
+        )
+        if not len(distance) or np.all(np.isnan(distance)):
+            return None
+        nearest = int(np.nanargmin(distance))
+        if distance[nearest] > self.with_gas_click_radius:
+            return None
+        return band.start + nearest
+
+    def with_gas_clicked(self, event):
+        """Нажатие левой кнопкой по отсчету спектра с веществом - вызов with_gas_click_callback(self, x, y)."""
+        # Нажатие по точке поглощения обработано absorption_click_callback
+        if event.button() != Qt.MouseButton.LeftButton or event.currentItem is self.absorption_scatter:
+            return
+        if not self.getViewBox().sceneBoundingRect().contains(event.scenePos()):
+            return
+        index = self.find_with_gas_sample(event.scenePos())
+        if index is None:
+            return
+        pyramid, _ = self.spectrum_layers[self.with_gas_curve]
+        event.accept()
+        self.with_gas_click_callback(self, float(pyramid.frequency[index]), float(pyramid.values[index]))
+
+    @staticmethod
+    def set_layer_data(item: PlotDataItem | ScatterPlotItem, visible: bool, x: np.ndarray, y: np.ndarray, **options):
+        """Данные слоя (options - параметры точек для setData); слой без данных очищается и скрывается."""
+        if visible:
+            item.setData(x=x, y=y, **options)
+        else:
+            item.setData(x=[], y=[])
+        item.setVisible(visible)
+
+    def update_legend(self, data_obj: DataAndProcessing):
+        """Испускает dataUpdated с данными легенды, если состав отображаемых слоев изменился."""
+        spectrometer_data = data_obj.get_spectra()
+        legend_data = []
+        if spectrometer_data.has_without_gas:
+            legend_data.append((self.color_without_gas, self.name_without_gas))
+        if spectrometer_data.has_with_gas:
             legend_data.append((self.color_with_gas, self.name_with_gas))
-
-        # Отрисовка точек поглощения
-        if isinstance(absorption_points, DataFrame) and not absorption_points.empty:
-            # Цвета для раскраски точек
-            conditions = [
-                # status=False
-                (absorption_points["status"] == False),
-                # status=None
-                (absorption_points["status"].isna()),
-                # status=True и source_neural_network=True
-                (absorption_points["status"] == True) & (absorption_points["source_neural_network"] == True),
-                # status=True и source_neural_network=False
-                (absorption_points["status"] == True) & (absorption_points["source_neural_network"] == False),
-            ]
-            self.absorption_scatter = ScatterPlotItem(
-                x=absorption_points["frequency"],
-                y=absorption_points["gamma"],
-                pen=mkPen("k"),
-                symbol="o",
-                brush=np.select(conditions, self.absorption_line_choices, default="#FFA500"),
-                symbolBrush="b",
-                size=8,
-            )
-            self.addItem(self.absorption_scatter)
-            # Подключаем callback если он задан
-            if self.absorption_click_callback:
-                self.absorption_scatter.sigClicked.connect(
-                    lambda plot, points: self.absorption_click_callback(self, plot, points)
-                )
+        if not data_obj.get_point_absorption().empty:
             legend_data.append(
                 (
                     list(self.absorption_line_colors_found_programmatically.values()),
@@ -167,14 +252,53 @@ class SpectrometerPlotWidget(PlotWidget):
                 )
             )
             legend_data.append((self.absorption_line_colors_found_manually, self.absorption_line_text_found_manually))
+        if legend_data != self.legend_data:
+            self.legend_data = legend_data
+            # Испускаем сигнал с обновленными данными для легенды
+            self.dataUpdated.emit(legend_data)
+
+    def get_absorption_brushes(self, status: np.ndarray, source_neural_network: np.ndarray) -> np.ndarray:
+        """Кисти точек поглощения по статусу и источнику (общие объекты из absorption_brushes)."""
+        conditions = [
+            # status=False
+            status == STATUS_REJECTED,
+            # status=None
+            status == STATUS_UNVERIFIED,
+            # status=True и source_neural_network=True
+            (status == STATUS_CONFIRMED) & source_neural_network,
+            # status=True и source_neural_network=False
+            (status == STATUS_CONFIRMED) & ~source_neural_network,
+        ]
+        # По умолчанию - цвет непроверенной точки
+        return self.absorption_brushes[np.select(conditions, list(range(len(conditions))), default=1)]
+
+    def update_absorption_points(self, data_obj: DataAndProcessing, change: AbsorptionChange):
+        """
+        Обновляет на графике только слой точек поглощения по описанию изменения, спектры не перерисовываются.
 
-        # Испускаем сигнал с обновленными данными для легенды
-        self.dataUpdated.emit(legend_data)
-
-    def update_absorption_point_color(self, status: list[bool]):
-        """Метод для обновления цвета конкретной точки поглощения по индексу"""
-        if self.absorption_scatter:
-            self.absorption_scatter.setBrush([self.absorption_line_colors_found_programmatically[s] for s in status])
+        При смене статуса меняется кисть только затронутых точек, иначе точки поглощения передаются в слой заново.
+        """
+        absorption_points = data_obj.get_point_absorption()
+        if change.kind == CHANGE_STATUS and len(self.absorption_scatter.data) == len(absorption_points):
+            indices = np.asarray(change.indices, dtype=np.intp)
+            brushes = self.get_absorption_brushes(
+                absorption_points.status[indices], absorption_points.source_neural_network[indices]
+            )
+            for index, brush in zip(indices.tolist(), brushes):
+                # Запись точки в данных слоя (как SpotItem.setBrush, без создания SpotItem для всех точек)
+                spot = self.absorption_scatter.data[index : index + 1]
+                spot["brush"] = brush
+                spot["sourceRect"] = (0, 0, 0, 0)
+                self.absorption_scatter.updateSpots(spot)
+            return
+        self.set_layer_data(
+            self.absorption_scatter,
+            not absorption_points.empty,
+            absorption_points.frequency.copy(),
+            absorption_points.gamma.copy(),
+            brush=list(self.get_absorption_brushes(absorption_points.status, absorption_points.source_neural_network)),
+        )
+        self.update_legend(data_obj)
 
     def zoom_to_region(self, x_min, x_max, y_min, y_max, padding_factor=0.1):
         """
@@ -261,21 +385,9 @@ if __name__ == "__main__":
     app = QApplication(sys.argv)
 
     data_processing = DataAndProcessing()
-    data_processing._DataAndProcessing__spectra = pd.DataFrame(
-        {
-            "frequency": [1, 2, 3, 4, 5],
-            "without_gas": [10, 15, 13, 18, 20],
-            "with_gas": [8, 14, 12, 17, 19],
-        }
-    )
-    data_processing._DataAndProcessing__point_absorption = pd.DataFrame(
-        {
-            "frequency": [2, 4],
-            "gamma": [14, 17],
-            "status": ["absorption", "absorption"],
-            "source_neural_network": [True, False],
-        }
-    )
+    data_processing._DataAndProcessing__spectra.set_column("without_gas", [1, 2, 3, 4, 5], [10, 15, 13, 18, 20])
+    data_processing._DataAndProcessing__spectra.set_column("with_gas", [1, 2, 3, 4, 5], [8, 14, 12, 17, 19])
+    data_processing.set_point_absorption([2, 4], [14, 17], [None, True], [True, False])
 
     main_window = SpectrometerPlotAndLegendWidget()
     main_window.plot_widget.plot_spectrometer_data(data_processing)
@@ -0,0 +1,85 @@
+from collections.abc import Callable
+from typing import NamedTuple
+
+import numpy as np
+from scipy.ndimage import uniform_filter1d
+from scipy.signal import butter, savgol_filter, sosfilt
+
+from detector_neural_network import setting
+from detector_neural_network.resampling import resample_uniform
+
+# Этапы подготовки спектра
+STAGE_RESAMPLE = "resample"  # Интерполяция на равномерную сетку частот
+STAGE_NOISE = "noise"  # Оценка порога шума (на равномерной сетке)
+STAGE_SMOOTH = "smooth"  # Сглаживание фильтром Савицкого-Голея (SAVGOL_FILTER_WINDOW_LENGTH, 0 - выключено)
+# Последний этап - выравнивание по сетке другого спектра - выполняет SpectrumData.set_column при записи,
+# так как он изменяет обе колонки спектров
+
+# Порядок этапов для спектров с веществом и без вещества
+WITH_SUBSTANCE_PIPELINE = (STAGE_RESAMPLE, STAGE_NOISE, STAGE_SMOOTH)
+# Спектр без вещества сглаживается по исходным точкам (до интерполяции)
+WITHOUT_SUBSTANCE_PIPELINE = (STAGE_SMOOTH, STAGE_RESAMPLE)
+
+NOISE_CUTOFF_FREQUENCY = 0.1
+
+
+class PreparedSpectrum(NamedTuple):
+    """Спектр на этапах подготовки: частоты, значения и порог шума (None - этап оценки шума не выполнялся)."""
+
+    frequency: np.ndarray
+    gamma: np.ndarray
+    smoothed_noise: float | None = None
+
+
+def resample_stage(spectrum: PreparedSpectrum) -> PreparedSpectrum:
+    """Интерполяция на равномерную сетку частот с шагом GRID_STEP."""
+    frequency, gamma = resample_uniform(spectrum.frequency, spectrum.gamma)
+    return spectrum._replace(frequency=frequency, gamma=gamma)
+
+
+def noise_stage(spectrum: PreparedSpectrum) -> PreparedSpectrum:
+    """Порог шума: СКО высокочастотной составляющей (ВЧ-фильтр Баттерворта, скользящее среднее по 3 точкам) * 5."""
+    sos = butter(3, NOISE_CUTOFF_FREQUENCY, btype="highpass", analog=False, output="sos")
+    noise = sosfilt(sos, spectrum.gamma)
+    return spectrum._replace(smoothed_noise=np.std(uniform_filter1d(noise, size=3)) * 5)
+
+
+def smooth_stage(spectrum: PreparedSpectrum) -> PreparedSpectrum:
+    """Сглаживание фильтром Савицкого-Голея (окно SAVGOL_FILTER_WINDOW_LENGTH, 0 - без сглаживания)."""
+    if setting.SAVGOL_FILTER_WINDOW_LENGTH == 0:
+        return spectrum
+    gamma = savgol_filter(spectrum.gamma, window_length=setting.SAVGOL_FILTER_WINDOW_LENGTH, polyorder=2)
+    return spectrum._replace(gamma=gamma)
+
+
+STAGES: dict[str, Callable[[PreparedSpectrum], PreparedSpectrum]] = {
+    STAGE_RESAMPLE: resample_stage,
+    STAGE_NOISE: noise_stage,
+    STAGE_SMOOTH: smooth_stage,
+}
+
+
+def run_pipeline(frequency, gamma, stages: tuple[str, ...]) -> PreparedSpectrum:
+    """
+    Подготовка спектра: этапы stages по порядку, каждый - один раз и один проход по данным.
+
+    Входные данные проверяются и приводятся к float64 один раз перед первым этапом.
+    Не изменяет данные DataAndProcessing, поэтому может выполняться в фоновом потоке.
+
+    :param frequency: Частоты исходного спектра.
+    :param gamma: Значения исходного спектра.
+    :param stages: Имена этапов (STAGE_*).
+    """
+    if len(set(stages)) != len(stages):
+        raise ValueError(f"Этапы подготовки спектра повторяются: {stages}")
+    unknown = [stage for stage in stages if stage not in STAGES]
+    if unknown:
+        raise KeyError(f"Неизвестные этапы подготовки спектра: {unknown}")
+    if len(frequency) != len(gamma):
+        raise ValueError("Количество частот не совпадает с количеством гамм")
+    if len(frequency) == 0:
+        raise ValueError("Частоты и значения не могут быть пустыми.")
+    spectrum = PreparedSpectrum(np.asarray(frequency, dtype=np.float64), np.asarray(gamma, dtype=np.float64))
+    for stage in stages:
+        spectrum = STAGES[stage](spectrum)
+    return spectrum
@@ -0,0 +1,74 @@
+import numpy as np
+
+# Шаг сетки частот спектров [МГц]
+GRID_STEP = 0.06
+# Относительный допуск, в пределах которого число шагов сетки считается целым (погрешность плавающей точки)
+GRID_TOLERANCE = 1e-9
+
+
+def uniform_grid_size(start: float, stop: float, step: float = GRID_STEP) -> int:
+    """
+    Количество узлов сетки np.arange(start, stop + step, step): узлы от start с шагом step, последний - не меньше stop.
+
+    В отличие от np.arange, число шагов (stop - start) / step, отличающееся от целого на погрешность вычислений,
+    считается целым: узел stop + step не добавляется, если stop лежит на сетке (например, при повторной
+    интерполяции уже полученной сетки), и узел stop не теряется.
+    """
+    steps = (stop - start) / step
+    nearest = round(steps)
+    if abs(steps - nearest) <= GRID_TOLERANCE * max(1.0, abs(nearest)):
+        steps = nearest
+    return int(np.ceil(steps)) + 1
+
+
+def uniform_grid(start: float, stop: float, step: float = GRID_STEP) -> np.ndarray:
+    """Узлы сетки от start до stop (uniform_grid_size узлов) с теми же значениями, что у np.arange."""
+    # np.arange вычисляет узел i как start + i * delta, где delta = (start + step) - start
+    delta = (start + step) - start
+    grid = np.arange(uniform_grid_size(start, stop, step), dtype=np.float64)
+    grid *= delta
+    grid += start
+    return grid
+
+
+def interpolate_linear(frequency: np.ndarray, values: np.ndarray, grid: np.ndarray) -> np.ndarray:
+    """
+    Линейная интерполяция значений с возрастающих частот на узлы grid за один проход (np.interp).
+
+    Узлы за пределами частот экстраполируются по крайним отрезкам, как interp1d(fill_value="extrapolate").
+    """
+    if len(frequency) < 2:
+        raise ValueError("Для интерполяции необходимо не менее двух точек.")
+    result = np.interp(grid, frequency, values)
+    # Узлы сетки возрастают - экстраполируемые узлы находятся в начале и в конце
+    left = int(np.searchsorted(grid, frequency[0], side="left"))
+    right = int(np.searchsorted(grid, frequency[-1], side="right"))
+    for outside, low, high in ((slice(0, left), 0, 1), (slice(right, len(grid)), -2, -1)):
+        if outside.start < outside.stop:
+            slope = (values[high] - values[low]) / (frequency[high] - frequency[low])
+            result[outside] = slope * (grid[outside] - frequency[low]) + values[low]
+    return result
+
+
+def resample_uniform(frequency, values, step: float = GRID_STEP) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Интерполяция значений на равномерную сетку частот от минимальной до максимальной частоты с шагом step.
+
+    Частоты спектрометра возрастают - сортировка выполняется, только если порядок нарушен. Сетка строится
+    uniform_grid (без лишнего или потерянного узла из-за погрешности np.arange).
+
+    :return: Узлы сетки и значения на них.
+    """
+    frequency = np.asarray(frequency, dtype=np.float64)
+    values = np.asarray(values, dtype=np.float64)
+    if len(frequency) != len(values):
+        raise ValueError("Количество частот не совпадает с количеством значений")
+    if len(frequency) == 0:
+        raise ValueError("Частоты и значения не могут быть пустыми.")
+    if len(frequency) < 2:
+        raise ValueError("Для интерполяции необходимо не менее двух точек.")
+    if np.any(frequency[1:] < frequency[:-1]):
+        order = np.argsort(frequency, kind="stable")
+        frequency, values = frequency[order], values[order]
+    grid = uniform_grid(frequency[0], frequency[-1], step)
+    return grid, interpolate_linear(frequency, values, grid)
@@ -0,0 +1,77 @@
+import os
+
+import numpy as np
+
+from detector_neural_network import setting
+from detector_neural_network.absorption_points import (
+    STATUS_CONFIRMED,
+    STATUS_REJECTED,
+    STATUS_UNVERIFIED,
+    AbsorptionPointStore,
+)
+
+# Заголовок и разделитель файла результата
+RESULT_HEADER = "FREQUENCY:\tGAMMA:\tSOURCE_NEURAL_NETWORK:\n"
+RESULT_SEPARATOR = "***********************************************************\n"
+
+
+def get_result_file_name(spectrum_file_name: str, directory: str, extension: str = "") -> str:
+    """Рекомендуемое имя файла результата 'Result_for_<имя файла спектра>' в заданной директории."""
+    base_name = os.path.splitext(os.path.basename(spectrum_file_name))[0]
+    return os.path.join(directory, f"Result_for_{base_name}{extension}")
+
+
+def get_result_statistics(point_absorption: AbsorptionPointStore) -> dict:
+    """Статистика точек поглощения для файла результата."""
+    # Количество точек нейронной сети по кодам статуса (-1, 0, 1)
+    nn_status = point_absorption.status[point_absorption.source_neural_network]
+    counts = np.bincount(nn_status - STATUS_UNVERIFIED, minlength=3)
+    return {
+        "RESULTS_FORMATTER_VERSION": setting.RESULTS_FORMATTER_VERSION,
+        "Обнаружено": len(nn_status),
+        "Подтверждено": int(counts[STATUS_CONFIRMED - STATUS_UNVERIFIED]),
+        "Отклонено": int(counts[STATUS_REJECTED - STATUS_UNVERIFIED]),
+        "Непроверенно": int(counts[0]),
+        "Добавлено вручную": len(point_absorption) - len(nn_status),
+        "Всего": len(point_absorption),
+    }
+
+
+def write_result_file(file_name: str, point_absorption: AbsorptionPointStore, include_unverified: bool = False) -> int:
+    """
+    Записывает точки поглощения в файл результата.
+
+    :param file_name: Путь к файлу результата.
+    :param point_absorption: Точки поглощения (DataAndProcessing.get_point_absorption).
+    :param include_unverified: Записывать, кроме подтвержденных, и непроверенные точки (обработка без оператора).
+    :return: Количество записанных точек.
+    """
+    # Запись только подтвержденных данных (status=True), при include_unverified - и непроверенных
+    selected = point_absorption.status == STATUS_CONFIRMED
+    if include_unverified:
+        selected |= point_absorption.status == STATUS_UNVERIFIED
+    rows = zip(
+        point_absorption.frequency[selected].tolist(),
+        point_absorption.gamma[selected].tolist(),
+        point_absorption.source_neural_network[selected].tolist(),
+    )
+    with open(file_name, "w", encoding="utf-8") as file:
+        # Заголовок
+        file.write(RESULT_HEADER)
+        file.writelines(f"{frequency}\t{gamma}\t{source}\n" for frequency, gamma, source in rows)
+        # Разделитель и статистика
+        file.write(RESULT_SEPARATOR)
+        stats = get_result_statistics(point_absorption)
+        file.write("\n".join(f"{key}: {value}" for key, value in stats.items()) + "\n")
+    return int(np.count_nonzero(selected))
+
+
+def read_result_file(file_name: str) -> list[tuple[float, float, bool]]:
+    """Читает точки поглощения (частота, гамма, найдена нейронной сетью) из файла результата."""
+    with open(file_name, "r", encoding="utf-8") as file:
+        return [
+            (float(freq), float(gam), src.lower() == "true")
+            for line in file
+            if "\t" in line and not line.startswith(("FREQ", "*"))
+            for freq, gam, src in [line.strip().split("\t")]
+        ]
@@ -17,7 +17,20 @@ USE_DEFAULT_FILE_PATH_NEURAL_NETWORK: bool = (
 DEFAULT_FILE_PATH_WITHOUT_SUBSTANCE: str = os.path.join(MODULE_DIR, "data", "example_spectrum", "without_substance.csv")
 DEFAULT_FILE_PATH_WITH_SUBSTANCE: str = os.path.join(MODULE_DIR, "data", "example_spectrum", "with_substance.csv")
 DEFAULT_FILE_PATH_NEURAL_NETWORK: str = os.path.join(MODULE_DIR, "data", "example_neural_network", "5_new.joblib")
-SAVGOL_FILTER_WINDOW_LENGTH: int = int(os.getenv("SAVGOL_FILTER_WINDOW_LENGTH", 10))  # Если 0, то фильтр выключен
+USE_SPECTRUM_CACHE: bool = os.getenv("USE_SPECTRUM_CACHE", "True").lower() == "true"  # Кэш разобранных спектров
+SAVGOL_FILTER_WINDOW_LENGTH: int = int(os.getenv("SAVGOL_FILTER_WINDOW_LENGTH", "10"))  # Если 0, то фильтр выключен
+# Пакетная обработка нейронной сетью: размер пакета окон (0 - по бюджету памяти) и бюджет памяти в МБ
+INFERENCE_BATCH_SIZE: int = int(os.getenv("INFERENCE_BATCH_SIZE", "0"))
+INFERENCE_MEMORY_BUDGET_MB: float = float(os.getenv("INFERENCE_MEMORY_BUDGET_MB", "256"))
+# Тип данных прямого прохода нейронной сети на numpy: float64 (совпадает со sklearn) или float32 (быстрее)
+INFERENCE_DTYPE: str = os.getenv("INFERENCE_DTYPE", "float64")
+# Параллельная обработка нейронной сетью: количество исполнителей (1 - последовательно) и их тип (thread/process)
+INFERENCE_WORKERS: int = int(os.getenv("INFERENCE_WORKERS", "1"))
+INFERENCE_EXECUTOR: str = os.getenv("INFERENCE_EXECUTOR", "thread")
+# Отрисовка спектров с уровнем детализации: огибающая min/max видимого диапазона по ширине графика в пикселях
+PLOT_LEVEL_OF_DETAIL: bool = os.getenv("PLOT_LEVEL_OF_DETAIL", "True").lower() == "true"
+# Символы точек спектра показываются, если видимых отсчетов на пиксель не больше порога
+PLOT_SYMBOL_MAX_POINTS_PER_PIXEL: float = float(os.getenv("PLOT_SYMBOL_MAX_POINTS_PER_PIXEL", "0.25"))
 ORGANIZATION: str = "Institute for Physics of Microstructures RAS"
 APPLICATION: str = "Detector - Neural_network"
 RESULTS_FORMATTER_VERSION: str = "1.0.0"
@@ -0,0 +1,111 @@
+import contextlib
+import hashlib
+import json
+import os
+import tempfile
+
+import numpy as np
+
+# Версия формата кэша (при изменении формата старые кэши считаются недействительными)
+CACHE_FORMAT_VERSION = 1
+# Суффиксы файлов кэша, лежащих рядом с исходным файлом
+CACHE_DATA_SUFFIX = ".spectrum.npy"
+CACHE_META_SUFFIX = ".spectrum.json"
+# Размер фрагмента файла, по которому считается хэш содержимого (начало, середина, конец)
+HASH_SAMPLE_SIZE = 1 << 16
+
+
+def get_cache_paths(file_name: str) -> tuple[str, str]:
+    """Возвращает пути к файлу данных и файлу метаданных кэша."""
+    return file_name + CACHE_DATA_SUFFIX, file_name + CACHE_META_SUFFIX
+
+
+def content_hash(file_name: str, size: int) -> str:
+    """
+    Хэш содержимого файла по фрагментам в начале, середине и конце.
+
+    Полное чтение многогигабайтного файла свело бы выигрыш от кэша на нет, поэтому хэшируются только фрагменты;
+    изменения в остальной части файла отслеживаются по времени изменения и размеру.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(file_name, "rb") as file:
+        for offset in sorted({0, max(0, size // 2 - HASH_SAMPLE_SIZE // 2), max(0, size - HASH_SAMPLE_SIZE)}):
+            file.seek(offset)
+            digest.update(file.read(HASH_SAMPLE_SIZE))
+    return digest.hexdigest()
+
+
+def get_cache_key(file_name: str) -> dict:
+    """Ключ кэша: путь, время изменения, размер и хэш содержимого исходного файла."""
+    stat = os.stat(file_name)
+    return {
+        "version": CACHE_FORMAT_VERSION,
+        "path": os.path.abspath(file_name),
+        "mtime_ns": stat.st_mtime_ns,
+        "size": stat.st_size,
+        "hash": content_hash(file_name, stat.st_size),
+    }
+
+
+def load_cached_spectrum(file_name: str, key: dict) -> tuple[np.ndarray, np.ndarray] | None:
+    """
+    Загружает разобранный спектр из кэша.
+
+    :param file_name: Путь к исходному файлу спектрометра.
+    :param key: Актуальный ключ кэша исходного файла (get_cache_key).
+    :return: Массивы частот и гамм (отображенные в память, только для чтения) или None, если кэш отсутствует
+        или устарел.
+    """
+    data_path, meta_path = get_cache_paths(file_name)
+    try:
+        with open(meta_path, encoding="utf-8") as file:
+            meta = json.load(file)
+        if meta.get("key") != key:
+            return None
+        columns = np.load(data_path, mmap_mode="r")
+    except (OSError, ValueError):
+        return None
+    if columns.ndim != 2 or columns.shape != (2, meta.get("rows")):
+        return None
+    return columns[0], columns[1]
+
+
+def write_file_atomic(path: str, write, text: bool = False) -> None:
+    """
+    Атомарная запись файла: содержимое пишется функцией write во временный файл с уникальным именем в том же
+    каталоге и переименовывается в path. Временный файл удаляется при любом исходе, поэтому одновременная запись
+    одного кэша несколькими процессами не смешивает содержимое и не оставляет файлов *.tmp.
+    """
+    directory, name = os.path.split(path)
+    handle, temp_path = tempfile.mkstemp(prefix=name + ".", suffix=".tmp", dir=directory or None)
+    try:
+        with os.fdopen(handle, "w" if text else "wb", encoding="utf-8" if text else None) as file:
+            write(file)
+        os.replace(temp_path, path)
+    finally:
+        with contextlib.suppress(OSError):
+            os.remove(temp_path)
+
+
+def save_cached_spectrum(file_name: str, key: dict, frequency: np.ndarray, gamma: np.ndarray) -> bool:
+    """
+    Сохраняет разобранный спектр в кэш рядом с исходным файлом.
+
+    Ключ должен быть получен до разбора файла, чтобы изменение файла во время разбора не попало в кэш.
+    Файлы пишутся атомарно (write_file_atomic). Метаданные удаляются перед записью данных и записываются
+    последними: кэш действителен, только если метаданные соответствуют уже записанным данным.
+    Ошибки записи (например, каталог только для чтения или данные кэша открыты в другом процессе) не прерывают работу.
+
+    :return: True, если кэш сохранен.
+    """
+    data_path, meta_path = get_cache_paths(file_name)
+    meta = {"key": key, "rows": len(frequency)}
+    columns = np.stack([frequency, gamma]).astype(np.float64, copy=False)
+    try:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(meta_path)
+        write_file_atomic(data_path, lambda file: np.save(file, columns))
+        write_file_atomic(meta_path, lambda file: json.dump(meta, file), text=True)
+    except OSError:
+        return False
+    return True
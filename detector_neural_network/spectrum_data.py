@@ -0,0 +1,99 @@
+import numpy as np
+from pandas import DataFrame
+
+from detector_neural_network.resampling import interpolate_linear
+from detector_neural_network.spectrum_envelope import MinMaxPyramid
+
+# Колонки спектров (порядок колонок DataFrame)
+COLUMNS = ("frequency", "without_gas", "with_gas")
+EMPTY = np.empty(0, dtype=np.float64)
+
+
+class SpectrumData:
+    """
+    Спектры с веществом и без вещества на общей сетке частот.
+
+    Хранятся непрерывными массивами float64 (frequency, with_gas, without_gas) одной длины. Колонка спектра, который
+    не задан, заполнена NaN; наличие спектров хранится флагами has_with_gas и has_without_gas, поэтому проверка
+    не требует прохода по данным. DataFrame строится только по запросу (to_dataframe).
+    Пирамиды min/max колонок (pyramid) строятся при первом запросе и сбрасываются при изменении колонки.
+    """
+
+    __slots__ = ("__pyramids", "frequency", "has_with_gas", "has_without_gas", "with_gas", "without_gas")
+
+    def __init__(self):
+        self.frequency: np.ndarray = EMPTY
+        self.with_gas: np.ndarray = EMPTY
+        self.without_gas: np.ndarray = EMPTY
+        self.has_with_gas: bool = False
+        self.has_without_gas: bool = False
+        self.__pyramids: dict[str, MinMaxPyramid] = {}
+
+    def __len__(self) -> int:
+        return len(self.frequency)
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        """Массив колонки по имени ('frequency', 'with_gas' или 'without_gas')."""
+        if column not in COLUMNS:
+            raise KeyError(column)
+        return getattr(self, column)
+
+    @property
+    def empty(self) -> bool:
+        """Сетка частот не задана."""
+        return len(self.frequency) == 0
+
+    def has(self, column: str) -> bool:
+        """Задан ли спектр 'with_gas' или 'without_gas'."""
+        return self.has_with_gas if column == "with_gas" else self.has_without_gas
+
+    def set_column(self, column: str, frequency: np.ndarray, values: np.ndarray) -> None:
+        """
+        Записывает значения на сетке частот в колонку спектра, выравнивая по уже заданной сетке.
+
+        Если сетки отличаются, общая сетка обрезается до пересечения диапазонов (вместе с другой колонкой),
+        а новые значения интерполируются на нее.
+
+        :param column: 'with_gas' или 'without_gas'.
+        :param frequency: Частоты сетки новых значений (по возрастанию).
+        :param values: Значения.
+        """
+        if column not in ("with_gas", "without_gas"):
+            raise KeyError(column)
+        frequency = np.asarray(frequency, dtype=np.float64)
+        values = np.asarray(values, dtype=np.float64)
+        # Частота пуста - данных не было - задаем
+        if self.empty:
+            self.frequency = frequency
+            self.with_gas = self.without_gas = np.full(len(frequency), np.nan)
+            self.__pyramids.clear()
+        # Частота задана, проверяем что они совпадают
+        elif len(self.frequency) != len(frequency) or not np.allclose(self.frequency, frequency):
+            keep = np.ones(len(self.frequency), dtype=bool)
+            if frequency.min() > self.frequency.min():
+                keep &= self.frequency >= frequency.min()
+            if frequency.max() < self.frequency.max():
+                keep &= self.frequency <= frequency.max()
+            if not keep.all():
+                self.frequency = self.frequency[keep]
+                self.with_gas = self.with_gas[keep]
+                self.without_gas = self.without_gas[keep]
+                self.__pyramids.clear()
+            if self.frequency[0] < frequency[0] or self.frequency[-1] > frequency[-1]:
+                raise ValueError("Сетка частот выходит за диапазон интерполируемых значений")
+            values = interpolate_linear(frequency, values, self.frequency)
+        setattr(self, column, values)
+        setattr(self, "has_" + column, len(values) > 0 and not np.isnan(values).all())
+        self.__pyramids.pop(column, None)
+
+    def pyramid(self, column: str) -> MinMaxPyramid:
+        """Пирамида min/max колонки 'with_gas' или 'without_gas' (строится один раз на загрузку спектра)."""
+        if column not in ("with_gas", "without_gas"):
+            raise KeyError(column)
+        if column not in self.__pyramids:
+            self.__pyramids[column] = MinMaxPyramid(self.frequency, self[column])
+        return self.__pyramids[column]
+
+    def to_dataframe(self) -> DataFrame:
+        """Таблица спектров (колонки frequency, without_gas, with_gas) - копия данных."""
+        return DataFrame({column: np.array(self[column]) for column in COLUMNS})
@@ -0,0 +1,101 @@
+import numpy as np
+
+
+def visible_slice(frequency: np.ndarray, x_min: float, x_max: float) -> slice:
+    """
+    Срез отсчетов спектра (частоты возрастают), попадающих в диапазон [x_min, x_max].
+
+    Срез расширен на один отсчет с каждой стороны, чтобы линия графика доходила до краев области просмотра.
+    """
+    first = int(np.searchsorted(frequency, x_min, side="left"))
+    last = int(np.searchsorted(frequency, x_max, side="right"))
+    return slice(max(first - 1, 0), min(last + 1, len(frequency)))
+
+
+class MinMaxPyramid:
+    """
+    Пирамида минимумов и максимумов спектра для отрисовки и масштабирования без прохода по всем отсчетам.
+
+    Уровень k хранит минимум и максимум блоков по 2**k отсчетов (уровень 0 - сами значения), всего около 2N
+    дополнительных значений. Строится один раз на загрузку спектра (SpectrumData.pyramid). NaN не участвуют
+    в минимумах и максимумах (блок из одних NaN - NaN).
+    """
+
+    __slots__ = ("frequency", "maximums", "minimums", "values")
+
+    def __init__(self, frequency: np.ndarray, values: np.ndarray):
+        """
+        :param frequency: Частоты спектра (по возрастанию).
+        :param values: Значения спектра.
+        """
+        self.frequency: np.ndarray = np.asarray(frequency, dtype=np.float64)
+        self.values: np.ndarray = np.asarray(values, dtype=np.float64)
+        self.minimums: list[np.ndarray] = [self.values]
+        self.maximums: list[np.ndarray] = [self.values]
+        while len(self.minimums[-1]) > 1:
+            minimums, maximums = self.minimums[-1], self.maximums[-1]
+            # Нечетный последний блок дополняется своим же значением
+            if len(minimums) % 2:
+                minimums = np.append(minimums, minimums[-1])
+                maximums = np.append(maximums, maximums[-1])
+            self.minimums.append(np.fmin(minimums[0::2], minimums[1::2]))
+            self.maximums.append(np.fmax(maximums[0::2], maximums[1::2]))
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def extent(self, x_min: float, x_max: float) -> tuple[float, float] | None:
+        """
+        Минимум и максимум значений на частотах [x_min, x_max] за O(log N) или None, если отсчетов в диапазоне нет.
+
+        Диапазон индексов раскладывается на не более чем два блока каждого уровня.
+        """
+        first = int(np.searchsorted(self.frequency, x_min, side="left"))
+        last = int(np.searchsorted(self.frequency, x_max, side="right"))
+        if first >= last:
+            return None
+        minimum = maximum = np.nan
+        level = 0
+        while first < last:
+            if first % 2:
+                minimum = np.fmin(minimum, self.minimums[level][first])
+                maximum = np.fmax(maximum, self.maximums[level][first])
+                first += 1
+            if last % 2:
+                last -= 1
+                minimum = np.fmin(minimum, self.minimums[level][last])
+                maximum = np.fmax(maximum, self.maximums[level][last])
+            first //= 2
+            last //= 2
+            level += 1
+        return float(minimum), float(maximum)
+
+    def envelope(self, x_min: float, x_max: float, bins: int) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Огибающая min/max для отображения диапазона [x_min, x_max] шириной bins пикселей.
+
+        Берется уровень с блоками не длиннее числа отсчетов на пиксель; каждый блок диапазона дает пару точек
+        (минимум, максимум) на частоте первого отсчета блока, поэтому пики не теряются при любом прореживании.
+        Границы блоков привязаны к индексам отсчетов - при сдвиге области просмотра огибающая не "дрожит".
+        Последний отсчет диапазона добавляется в конец, чтобы линия доходила до края данных.
+        Если отсчетов не больше двух на пиксель, возвращаются отсчеты диапазона без прореживания.
+
+        :return: Частоты и значения для отрисовки.
+        """
+        visible = visible_slice(self.frequency, x_min, x_max)
+        count = visible.stop - visible.start
+        bins = max(int(bins), 1)
+        if count <= 2 * bins:
+            return self.frequency[visible], self.values[visible]
+        level = min(int(np.log2(count / bins)), len(self.minimums) - 1)
+        first_block = visible.start >> level
+        last_block = (visible.stop - 1) >> level
+        starts = np.arange(first_block, last_block + 1) << level
+        envelope_x = np.empty(2 * len(starts) + 1)
+        envelope_y = np.empty(2 * len(starts) + 1)
+        envelope_x[0:-1:2] = envelope_x[1:-1:2] = self.frequency[starts]
+        envelope_y[0:-1:2] = self.minimums[level][first_block : last_block + 1]
+        envelope_y[1:-1:2] = self.maximums[level][first_block : last_block + 1]
+        envelope_x[-1] = self.frequency[visible.stop - 1]
+        envelope_y[-1] = self.values[visible.stop - 1]
+        return envelope_x, envelope_y
@@ -0,0 +1,186 @@
+import io
+import mmap
+import os
+from collections.abc import Callable, Iterator
+
+import numpy as np
+
+from detector_neural_network import setting
+from detector_neural_network.frequency_index import FrequencyIndex
+from detector_neural_network.spectrum_cache import get_cache_key, load_cached_spectrum, save_cached_spectrum
+
+# Маркеры формата файла спектрометра
+HEADER_MARKER = b"Index:"
+TRAILER_MARKERS = (b"*", b"Finish")
+# Номера столбцов (с нуля) FREQUENCY и GAMMA
+FREQUENCY_COLUMN = 1
+GAMMA_COLUMN = 4
+# Размер блока при поиске переводов строк (байт) и при разборе (строк)
+SCAN_BLOCK_SIZE = 1 << 24
+PARSE_BLOCK_ROWS = 1 << 16
+# Размер порции файла при потоковом чтении (байт)
+CHUNK_SIZE = 1 << 22
+
+
+def find_data_bounds(buffer) -> tuple[int, int]:
+    """
+    Находит границы блока данных в содержимом файла спектрометра.
+
+    :param buffer: Содержимое файла (bytes или mmap).
+    :return: Смещения начала и конца (не включая) строк с данными.
+    """
+    start = 0
+    # Пропуск заголовка 'Index: ...'
+    if buffer[: len(HEADER_MARKER)] == HEADER_MARKER:
+        start = buffer.find(b"\n") + 1 or len(buffer)
+    # Поиск завершения данных: строка из звездочек или 'Finish'.
+    # Строки с данными начинаются с цифры, поэтому достаточно первого найденного маркера (один проход по файлу)
+    for marker in TRAILER_MARKERS:
+        if buffer[start : start + len(marker)] == marker:
+            return start, start
+        position = buffer.find(b"\n" + marker, start)
+        if position != -1:
+            return start, position + 1
+    return start, len(buffer)
+
+
+def build_row_offsets(buffer, start: int, stop: int, block_size: int = SCAN_BLOCK_SIZE) -> np.ndarray:
+    """
+    Строит индекс смещений строк блока данных за один проход по файлу.
+
+    :param buffer: Содержимое файла (bytes или mmap).
+    :param start: Смещение начала данных.
+    :param stop: Смещение конца данных.
+    :param block_size: Размер блока сканирования, ограничивает временную память.
+    :return: Массив int64 длины rows + 1: начала строк и конец последней строки.
+    """
+    line_ends = []
+    for offset in range(start, stop, block_size):
+        count = min(block_size, stop - offset)
+        block = np.frombuffer(buffer, dtype=np.uint8, count=count, offset=offset)
+        line_ends.append(np.flatnonzero(block == ord("\n")) + (offset + 1))
+    offsets = np.concatenate([np.array([start], dtype=np.int64), *line_ends])
+    # Последняя строка без перевода строки
+    if offsets[-1] != stop:
+        offsets = np.append(offsets, stop)
+    return offsets
+
+
+def parse_columns(stream, rows: int | None = None) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Парсит столбцы FREQUENCY и GAMMA из потока строк с данными.
+
+    :param stream: Файловый объект, установленный на начало данных.
+    :param rows: Количество строк с данными (None - до конца потока).
+    :return: Непрерывные массивы float64 частот и гамм.
+    """
+    if rows == 0:
+        return np.empty(0, dtype=np.float64), np.empty(0, dtype=np.float64)
+    # Разбор целиком в C-парсере numpy (без построчной обработки в Python)
+    columns = np.loadtxt(
+        stream,
+        dtype=np.float64,
+        comments=None,
+        usecols=(FREQUENCY_COLUMN, GAMMA_COLUMN),
+        max_rows=rows,
+        ndmin=2,
+    )
+    return np.ascontiguousarray(columns[:, 0]), np.ascontiguousarray(columns[:, 1])
+
+
+def iter_spectrum_chunks(file_name: str, chunk_size: int = CHUNK_SIZE) -> Iterator[tuple[np.ndarray, np.ndarray]]:
+    """
+    Потоковое чтение файла спектрометра порциями целых строк, без загрузки всех столбцов в память.
+
+    :param file_name: Путь к файлу спектрометра.
+    :param chunk_size: Примерный размер порции в байтах.
+    :return: Итератор порций (частоты, гаммы).
+    """
+    if os.path.getsize(file_name) == 0:
+        return
+    with open(file_name, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+        start, stop = find_data_bounds(buffer)
+        while start < stop:
+            # Порция заканчивается на границе строки
+            end = buffer.find(b"\n", min(start + chunk_size, stop) - 1, stop) + 1 or stop
+            yield parse_columns(io.BytesIO(buffer[start:end]))
+            start = end
+
+
+class SpectrumFile:
+    """
+    Файл спектрометра, отображенный в память (mmap).
+
+    Файл сканируется один раз для построения индекса смещений строк, затем столбцы разбираются блоками строк
+    в заранее выделенные массивы. В памяти остаются только числовые столбцы, текст файла целиком не копируется.
+    При включенном кэше (setting.USE_SPECTRUM_CACHE) столбцы берутся из бинарного файла рядом с исходным,
+    если он актуален, иначе после разбора кэш создается заново. Для спектра из кэша индекс строк не строится.
+    Для выборки диапазона частот при первом запросе строится индекс частот (FrequencyIndex).
+    Функция progress вызывается после каждого блока строк (разобрано строк, всего строк).
+    """
+
+    __slots__ = ("file_name", "frequency", "frequency_index", "gamma", "row_offsets")
+
+    def __init__(
+        self,
+        file_name: str,
+        use_cache: bool | None = None,
+        progress: Callable[[int, int], None] | None = None,
+    ):
+        self.file_name: str = file_name
+        self.row_offsets: np.ndarray | None = np.zeros(1, dtype=np.int64)
+        self.frequency: np.ndarray = np.empty(0, dtype=np.float64)
+        self.gamma: np.ndarray = np.empty(0, dtype=np.float64)
+        self.frequency_index: FrequencyIndex | None = None
+        # Пустой файл нельзя отобразить в память
+        if os.path.getsize(file_name) == 0:
+            return
+        # Попытка загрузки из кэша
+        use_cache = setting.USE_SPECTRUM_CACHE if use_cache is None else use_cache
+        cache_key = get_cache_key(file_name) if use_cache else None
+        if use_cache:
+            cached = load_cached_spectrum(file_name, cache_key)
+            if cached is not None:
+                self.row_offsets = None
+                self.frequency, self.gamma = cached
+                return
+        self.parse_file(progress)
+        if use_cache:
+            save_cached_spectrum(file_name, cache_key, self.frequency, self.gamma)
+
+    def parse_file(self, progress: Callable[[int, int], None] | None = None) -> None:
+        """Разбор исходного файла через mmap."""
+        with open(self.file_name, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            start, stop = find_data_bounds(buffer)
+            self.row_offsets = build_row_offsets(buffer, start, stop)
+            self.frequency = np.empty(self.rows, dtype=np.float64)
+            self.gamma = np.empty(self.rows, dtype=np.float64)
+            for first in range(0, self.rows, PARSE_BLOCK_ROWS):
+                last = min(first + PARSE_BLOCK_ROWS, self.rows)
+                # Временная копия ограничена одним блоком строк
+                block = io.BytesIO(buffer[self.row_offsets[first] : self.row_offsets[last]])
+                self.frequency[first:last], self.gamma[first:last] = parse_columns(block, last - first)
+                if progress is not None:
+                    progress(last, self.rows)
+
+    def __len__(self) -> int:
+        return self.rows
+
+    @property
+    def rows(self) -> int:
+        """Количество строк с данными."""
+        return len(self.frequency) if self.row_offsets is None else len(self.row_offsets) - 1
+
+    def get_data(
+        self, start_frequency: float | None = None, end_frequency: float | None = None
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Возвращает массивы частот и гамм (при указании границ - только в заданном диапазоне частот)."""
+        if start_frequency is None and end_frequency is None:
+            return self.frequency, self.gamma
+        # Индекс строится один раз, далее выборка - двоичный поиск и срез
+        if self.frequency_index is None:
+            self.frequency_index = FrequencyIndex(self.frequency)
+        start_frequency = -np.inf if start_frequency is None else start_frequency
+        end_frequency = np.inf if end_frequency is None else end_frequency
+        in_range = self.frequency_index.select(start_frequency, end_frequency)
+        return self.frequency[in_range], self.gamma[in_range]
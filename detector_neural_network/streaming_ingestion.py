@@ -0,0 +1,271 @@
+from collections.abc import Iterable
+
+import numpy as np
+from scipy.ndimage import uniform_filter1d
+from scipy.signal import butter, savgol_filter, sosfilt
+
+from detector_neural_network import setting
+from detector_neural_network.preprocessing import NOISE_CUTOFF_FREQUENCY
+from detector_neural_network.resampling import GRID_STEP, uniform_grid_size
+
+EMPTY = np.empty(0, dtype=np.float64)
+
+
+class GrowableArray:
+    """
+    Растущий массив float64 для записи результата по частям.
+
+    Без пути хранится в памяти с удвоением емкости, с путем - в файле, отображенном в память (np.memmap),
+    который увеличивается при заполнении.
+    """
+
+    __slots__ = ("buffer", "path", "size")
+
+    def __init__(self, path: str | None = None, capacity: int = 1 << 16):
+        self.path: str | None = path
+        self.size: int = 0
+        self.buffer: np.ndarray = self.allocate(capacity, mode="w+")
+
+    def allocate(self, capacity: int, mode: str = "r+") -> np.ndarray:
+        if self.path is None:
+            buffer = np.empty(capacity, dtype=np.float64)
+            if self.size:
+                buffer[: self.size] = self.buffer[: self.size]
+            return buffer
+        # Файл увеличивается np.memmap при открытии с большим размером
+        return np.memmap(self.path, dtype=np.float64, mode=mode, shape=(capacity,))
+
+    def extend(self, values: np.ndarray) -> None:
+        """Добавляет значения в конец массива."""
+        required = self.size + len(values)
+        if required > len(self.buffer):
+            if isinstance(self.buffer, np.memmap):
+                self.buffer.flush()
+            self.buffer = self.allocate(max(required, 2 * len(self.buffer)))
+        self.buffer[self.size : required] = values
+        self.size = required
+
+    def to_array(self) -> np.ndarray:
+        """Возвращает заполненную часть массива (без копирования)."""
+        if isinstance(self.buffer, np.memmap):
+            self.buffer.flush()
+            return self.buffer[: self.size]
+        # Запас емкости в памяти освобождается уменьшением массива на месте (других ссылок на буфер нет)
+        self.buffer.resize(self.size, refcheck=False)
+        return self.buffer
+
+
+class StreamingResampler:
+    """
+    Потоковая линейная интерполяция на равномерную сетку частот.
+
+    Сетка совпадает с resample_uniform для возрастающих частот: узлы, попавшие внутрь уже полученных
+    данных, выдаются сразу, хвост сетки за последней частотой экстраполируется по последнему отрезку в finish().
+    """
+
+    __slots__ = ("delta", "last_x", "last_y", "next_index", "start", "step")
+
+    def __init__(self, step: float = GRID_STEP):
+        self.step: float = step
+        self.start: float | None = None
+        self.delta: float = step
+        self.next_index: int = 0
+        # Последние две точки исходных данных (для интерполяции через границу порций и экстраполяции)
+        self.last_x: np.ndarray = EMPTY
+        self.last_y: np.ndarray = EMPTY
+
+    def grid(self, first: int, last: int) -> np.ndarray:
+        """Узлы сетки с номерами [first, last), как их вычисляет np.arange."""
+        return self.start + self.delta * np.arange(first, last)
+
+    def push(self, x: np.ndarray, y: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Принимает порцию исходных данных, возвращает готовые узлы сетки."""
+        if len(x) == 0:
+            return EMPTY, EMPTY
+        x = np.concatenate([self.last_x, x])
+        y = np.concatenate([self.last_y, y])
+        if np.any(x[1:] < x[:-1]):
+            raise ValueError("Частоты в потоке должны возрастать.")
+        if self.start is None:
+            self.start = x[0]
+            self.delta = (self.start + self.step) - self.start
+        # Последний узел сетки, не выходящий за последнюю полученную частоту
+        last = int((x[-1] - self.start) // self.delta) + 1
+        while last > self.next_index and self.grid(last - 1, last)[0] > x[-1]:
+            last -= 1
+        grid_x = self.grid(self.next_index, last)
+        self.next_index = max(self.next_index, last)
+        self.last_x, self.last_y = x[-2:], y[-2:]
+        return grid_x, np.interp(grid_x, x, y)
+
+    def finish(self) -> tuple[np.ndarray, np.ndarray]:
+        """Экстраполирует оставшиеся узлы сетки до max + step."""
+        if self.start is None:
+            raise ValueError("Частоты и значения не могут быть пустыми.")
+        total = uniform_grid_size(self.start, self.last_x[-1], self.step)
+        grid_x = self.grid(self.next_index, total)
+        self.next_index = max(self.next_index, total)
+        if len(grid_x) == 0:
+            return EMPTY, EMPTY
+        if len(self.last_x) < 2:
+            raise ValueError("Для экстраполяции необходимо не менее двух точек.")
+        (x_low, x_high), (y_low, y_high) = self.last_x, self.last_y
+        slope = (y_high - y_low) / (x_high - x_low)
+        return grid_x, slope * (grid_x - x_low) + y_low
+
+
+class StreamingSavgolFilter:
+    """
+    Потоковый фильтр Савицкого-Голея, совпадающий с savgol_filter(mode="interp") по всему массиву.
+
+    Между порциями переносится хвост из window_length точек: внутренние точки считаются той же сверткой, а краевые
+    (полиномиальная аппроксимация по первым и последним window_length точкам) - только на краях всего потока.
+    """
+
+    __slots__ = ("buffer_x", "buffer_y", "carry", "half", "polyorder", "started", "window_length")
+
+    def __init__(self, window_length: int, polyorder: int = 2):
+        self.window_length: int = window_length
+        self.polyorder: int = polyorder
+        self.half: int = window_length // 2
+        # Количество переносимых точек: контекст окна и не менее одного окна для краевой аппроксимации
+        self.carry: int = max(2 * self.half, window_length)
+        self.buffer_x: np.ndarray = EMPTY
+        self.buffer_y: np.ndarray = EMPTY
+        self.started: bool = False
+
+    def push(self, x: np.ndarray, y: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Принимает порцию данных, возвращает отфильтрованные точки, для которых известно все окно."""
+        self.buffer_x = np.concatenate([self.buffer_x, x])
+        self.buffer_y = np.concatenate([self.buffer_y, y])
+        size = len(self.buffer_y)
+        if size < 2 * self.carry:
+            return EMPTY, EMPTY
+        smoothed = savgol_filter(self.buffer_y, window_length=self.window_length, polyorder=self.polyorder)
+        first = 0 if not self.started else self.carry - self.half
+        last = size - self.half
+        result = self.buffer_x[first:last], smoothed[first:last]
+        self.buffer_x, self.buffer_y = self.buffer_x[size - self.carry :], self.buffer_y[size - self.carry :]
+        self.started = True
+        return result
+
+    def finish(self) -> tuple[np.ndarray, np.ndarray]:
+        """Фильтрует остаток потока вместе с правым краем."""
+        if len(self.buffer_y) == 0:
+            return EMPTY, EMPTY
+        smoothed = savgol_filter(self.buffer_y, window_length=self.window_length, polyorder=self.polyorder)
+        first = 0 if not self.started else self.carry - self.half
+        return self.buffer_x[first:], smoothed[first:]
+
+
+class StreamingNoiseEstimator:
+    """
+    Потоковая оценка уровня шума: np.std(uniform_filter1d(sosfilt(sos, gamma), size=3)) * 5.
+
+    Состояние ВЧ-фильтра Баттерворта (zi) переносится между порциями, скользящее среднее считается с переносом
+    двух точек, а стандартное отклонение накапливается по порциям (объединение среднего и суммы квадратов отклонений).
+    """
+
+    __slots__ = ("carry", "count", "m2", "mean", "sos", "started", "zi")
+
+    def __init__(self, cutoff_frequency: float = NOISE_CUTOFF_FREQUENCY):
+        self.sos: np.ndarray = butter(3, cutoff_frequency, btype="highpass", analog=False, output="sos")
+        self.zi: np.ndarray = np.zeros((self.sos.shape[0], 2))
+        self.carry: np.ndarray = EMPTY
+        self.started: bool = False
+        self.count: int = 0
+        self.mean: float = 0.0
+        self.m2: float = 0.0
+
+    def accumulate(self, values: np.ndarray) -> None:
+        """Объединяет статистику порции с накопленной."""
+        if len(values) == 0:
+            return
+        count = len(values)
+        mean = values.mean()
+        m2 = np.sum((values - mean) ** 2)
+        total = self.count + count
+        delta = mean - self.mean
+        self.m2 += m2 + delta**2 * self.count * count / total
+        self.mean += delta * count / total
+        self.count = total
+
+    def push(self, gamma: np.ndarray) -> None:
+        """Принимает порцию значений на равномерной сетке."""
+        if len(gamma) == 0:
+            return
+        noise, self.zi = sosfilt(self.sos, gamma, zi=self.zi)
+        buffer = np.concatenate([self.carry, noise])
+        if len(buffer) < 3:
+            self.carry = buffer
+            return
+        smoothed = uniform_filter1d(buffer, size=3)
+        self.accumulate(smoothed[(1 if self.started else 0) : -1])
+        self.carry = buffer[-2:]
+        self.started = True
+
+    def finish(self) -> float:
+        """Возвращает порог шума по всему потоку."""
+        if len(self.carry):
+            smoothed = uniform_filter1d(self.carry, size=3)
+            self.accumulate(smoothed[1:] if self.started else smoothed)
+            self.carry = EMPTY
+        return np.sqrt(self.m2 / self.count) * 5 if self.count else np.nan
+
+
+def ingest_spectrum_chunks(
+    chunks: Iterable[tuple[np.ndarray, np.ndarray]],
+    estimate_noise: bool = True,
+    smooth_before_resample: bool = False,
+    backing_path: str | None = None,
+) -> tuple[np.ndarray, np.ndarray, float | None]:
+    """
+    Потоковая подготовка спектра: интерполяция на сетку с шагом GRID_STEP, оценка шума и сглаживание по порциям.
+
+    Порядок этапов совпадает с DataAndProcessing.set_spectrum_with_substance (интерполяция, шум, сглаживание)
+    или, при smooth_before_resample, с set_spectrum_without_substance (сглаживание, интерполяция).
+    Память ограничена размером порции и окна фильтра, результат пишется в растущий массив.
+
+    :param chunks: Итератор порций (частоты, гаммы) с возрастающими частотами.
+    :param estimate_noise: Вычислять порог шума.
+    :param smooth_before_resample: Сглаживать исходные точки до интерполяции.
+    :param backing_path: Префикс файлов для хранения результата в np.memmap (None - в памяти).
+    :return: Частоты сетки, значения, порог шума (None, если не вычислялся).
+    """
+    resampler = StreamingResampler()
+    smoother = (
+        StreamingSavgolFilter(setting.SAVGOL_FILTER_WINDOW_LENGTH) if setting.SAVGOL_FILTER_WINDOW_LENGTH else None
+    )
+    noise_estimator = StreamingNoiseEstimator() if estimate_noise else None
+    frequency_store = GrowableArray(None if backing_path is None else backing_path + ".frequency.dat")
+    gamma_store = GrowableArray(None if backing_path is None else backing_path + ".gamma.dat")
+
+    def store(x: np.ndarray, y: np.ndarray) -> None:
+        frequency_store.extend(x)
+        gamma_store.extend(y)
+
+    def after_resample(x: np.ndarray, y: np.ndarray) -> None:
+        # Этапы после интерполяции на сетку
+        if noise_estimator is not None:
+            noise_estimator.push(y)
+        if smoother is not None and not smooth_before_resample:
+            x, y = smoother.push(x, y)
+        store(x, y)
+
+    for frequency, gamma in chunks:
+        frequency = np.asarray(frequency, dtype=np.float64)
+        gamma = np.asarray(gamma, dtype=np.float64)
+        if len(frequency) != len(gamma):
+            raise ValueError("Количество частот не совпадает с количеством гамм")
+        if smoother is not None and smooth_before_resample:
+            frequency, gamma = smoother.push(frequency, gamma)
+        after_resample(*resampler.push(frequency, gamma))
+
+    # Завершение потока: остатки фильтров и хвост сетки
+    if smoother is not None and smooth_before_resample:
+        after_resample(*resampler.push(*smoother.finish()))
+    after_resample(*resampler.finish())
+    if smoother is not None and not smooth_before_resample:
+        store(*smoother.finish())
+    smoothed_noise = noise_estimator.finish() if noise_estimator is not None else None
+    return frequency_store.to_array(), gamma_store.to_array(), smoothed_noise
@@ -0,0 +1,40 @@
+from collections.abc import Iterator
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Размер пакета окон по умолчанию
+DEFAULT_BATCH_SIZE = 1 << 14
+
+
+def count_windows(length: int, window_width: int) -> int:
+    """Количество перекрывающихся окон заданной ширины в массиве длины length."""
+    return max(length - window_width + 1, 0)
+
+
+def sliding_windows(values: np.ndarray, window_width: int) -> np.ndarray:
+    """
+    Перекрывающиеся окна заданной ширины как представление массива (без копирования).
+
+    Окно i - строка values[i : i + window_width]. Представление только для чтения, т.к. окна разделяют память.
+
+    :return: Массив формы (len(values) - window_width + 1, window_width).
+    """
+    values = np.asarray(values)
+    if count_windows(len(values), window_width) == 0:
+        return np.empty((0, window_width), dtype=values.dtype)
+    return sliding_window_view(values, window_width)
+
+
+def iter_window_batches(
+    values: np.ndarray, window_width: int, batch_size: int = DEFAULT_BATCH_SIZE
+) -> Iterator[np.ndarray]:
+    """
+    Выдает окна пакетами не более batch_size окон.
+
+    Пакеты - представления исходного массива, поэтому память при обработке O(N + batch_size * window_width),
+    если потребитель копирует не более одного пакета за раз.
+    """
+    windows = sliding_windows(values, window_width)
+    for start in range(0, len(windows), batch_size):
+        yield windows[start : start + batch_size]
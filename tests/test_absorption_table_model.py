@@ -0,0 +1,148 @@
+import os
+
+import numpy as np
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from pyqtgraph.Qt.QtCore import QtMsgType, qInstallMessageHandler  # noqa: E402
+from pyqtgraph.Qt.QtWidgets import QApplication  # noqa: E402
+from PySide6.QtTest import QAbstractItemModelTester  # noqa: E402
+
+from detector_neural_network.absorption_points import (  # noqa: E402
+    ABSORPTION_RESET,
+    STATUS_CONFIRMED,
+    STATUS_REJECTED,
+)
+from detector_neural_network.absorption_table_model import (  # noqa: E402
+    FILTER_ALL,
+    FILTER_CONFIRMED,
+    FILTER_MANUAL,
+    FILTER_REJECTED,
+    FILTER_UNVERIFIED,
+    AbsorptionFilterProxyModel,
+    AbsorptionTableModel,
+)
+from detector_neural_network.data_and_processing import DataAndProcessing  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def application():
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def qt_warnings():
+    """Предупреждения Qt (в том числе ошибки QAbstractItemModelTester в режиме Warning)."""
+    messages = []
+
+    def handler(message_type, context, message):
+        if message_type != QtMsgType.QtDebugMsg:
+            messages.append(message)
+
+    previous = qInstallMessageHandler(handler)
+    yield messages
+    qInstallMessageHandler(previous)
+
+
+@pytest.fixture
+def tested_models(application, qt_warnings):
+    """Данные, модель и фильтр, подключенные как в GuiProgram, под проверкой QAbstractItemModelTester."""
+    data = DataAndProcessing()
+    model = AbsorptionTableModel(data)
+    proxy = AbsorptionFilterProxyModel()
+    proxy.setSourceModel(model)
+    data.set_absorption_pre_interceptor(model.about_to_change)
+    data.set_absorption_interceptor(lambda *args, change, **kwargs: model.apply_change(change))
+    mode = QAbstractItemModelTester.FailureReportingMode.Warning
+    testers = [QAbstractItemModelTester(model, mode), QAbstractItemModelTester(proxy, mode)]
+    yield data, model, proxy
+    del testers
+    assert qt_warnings == []
+
+
+def proxy_rows(proxy: AbsorptionFilterProxyModel) -> list[int]:
+    return [proxy.mapToSource(proxy.index(row, 0)).row() for row in range(proxy.rowCount())]
+
+
+def test_insert_and_delete_rows(tested_models):
+    data, model, proxy = tested_models
+    data.set_point_absorption([10.0, 20.0, 30.0], [1.0, 2.0, 3.0], [None, None, None], [True, True, True])
+    rows = []
+    model.rowsInserted.connect(lambda parent, first, last: rows.append(("insert", first, last)))
+    model.rowsRemoved.connect(lambda parent, first, last: rows.append(("remove", first, last)))
+
+    # В начало, в середину (после точки с той же частотой) и в конец
+    for frequency in (5.0, 20.0, 40.0):
+        data.add_new_point_absorption(frequency, 7.0)
+    assert rows == [("insert", 0, 0), ("insert", 3, 3), ("insert", 5, 5)]
+    assert model.rowCount() == proxy.rowCount() == 6
+    assert [model.index(row, 0).data() for row in range(model.rowCount())] == [
+        f"{frequency:.3f}" for frequency in (5.0, 10.0, 20.0, 20.0, 30.0, 40.0)
+    ]
+
+    rows.clear()
+    data.del_point_absorption_by_index(3)
+    data.del_point_absorption(5.0, 7.0)
+    # Точка нейронной сети не удаляется
+    data.del_point_absorption(10.0, 1.0)
+    assert rows == [("remove", 3, 3), ("remove", 0, 0)]
+    assert model.rowCount() == proxy.rowCount() == 4
+
+
+def test_delete_several_points(tested_models):
+    data, model, proxy = tested_models
+    data.set_point_absorption([10.0, 20.0, 30.0], [1.0, 2.0, 3.0])
+    for _ in range(3):
+        data.add_new_point_absorption(20.0, 5.0)
+    data.add_new_point_absorption(20.0, 6.0)
+    data.add_new_point_absorption(20.0, 5.0)
+
+    # Подряд идущие строки 2-4 и отдельная строка 6 с теми же координатами
+    data.del_point_absorption(20.0, 5.0)
+    assert model.rowCount() == proxy.rowCount() == 4
+    assert data.get_point_absorption().gamma.tolist() == [1.0, 2.0, 6.0, 3.0]
+
+
+def test_status_changes_and_filters(tested_models):
+    data, model, proxy = tested_models
+    data.set_point_absorption([10.0, 20.0, 30.0], [1.0, 2.0, 3.0])
+    data.add_new_point_absorption(25.0, 4.0)
+
+    proxy.set_filter_mode(FILTER_UNVERIFIED)
+    assert proxy_rows(proxy) == [0, 1, 3]
+    data.set_status_point_absorption_by_index(0, True)
+    data.set_status_point_absorption_by_coordinates(20.0, 2.0, False)
+    assert proxy_rows(proxy) == [3]
+    proxy.set_filter_mode(FILTER_CONFIRMED)
+    assert proxy_rows(proxy) == [0]
+    proxy.set_filter_mode(FILTER_REJECTED)
+    assert proxy_rows(proxy) == [1]
+    proxy.set_filter_mode(FILTER_MANUAL)
+    assert proxy_rows(proxy) == [2]
+
+    # Вставка и удаление при включенном фильтре
+    data.add_new_point_absorption(15.0, 5.0)
+    assert proxy_rows(proxy) == [1, 3]
+    data.del_point_absorption_by_index(1)
+    assert proxy_rows(proxy) == [2]
+    proxy.set_filter_mode(FILTER_ALL)
+    assert proxy.rowCount() == model.rowCount() == 4
+    assert data.get_point_absorption().status.tolist()[:2] == [STATUS_CONFIRMED, STATUS_REJECTED]
+
+
+def test_reset_changes(tested_models):
+    data, model, proxy = tested_models
+    data.set_point_absorption(np.arange(100.0), np.ones(100))
+    assert model.rowCount() == proxy.rowCount() == 100
+
+    # Ошибка после сообщения об изменении не оставляет модель в незавершенном сбросе
+    with pytest.raises(ValueError):
+        data.set_point_absorption([1.0, 2.0], [1.0])
+    data.add_new_point_absorption(50.5, 1.0)
+    assert model.rowCount() == proxy.rowCount() == 101
+
+    # Замена точек без сообщения о предстоящем изменении (как после очистки данных в GuiProgram.table)
+    data.clear_point_absorption()
+    model.apply_change(ABSORPTION_RESET)
+    assert model.rowCount() == proxy.rowCount() == 0
@@ -0,0 +1,63 @@
+import warnings
+
+import numpy as np
+import pytest
+from joblib import load
+from sklearn.exceptions import ConvergenceWarning, InconsistentVersionWarning
+from sklearn.neural_network import MLPClassifier
+
+from detector_neural_network import setting
+from detector_neural_network.mlp_engine import FLOAT32_TOLERANCE, MlpInferenceEngine
+from detector_neural_network.spectrum_reader import SpectrumFile
+from detector_neural_network.windowing import sliding_windows
+
+
+def train_classifier(classes: int, activation: str, multilabel: bool = False) -> tuple[MLPClassifier, np.ndarray]:
+    """Небольшая сеть, обученная на синтетических данных, и проверочные входы."""
+    rng = np.random.default_rng(classes)
+    inputs = rng.normal(size=(400, 12))
+    if multilabel:
+        targets = np.column_stack([inputs[:, 0] > 0, inputs[:, 1] > 0, inputs[:, 2] > 0]).astype(int)
+    else:
+        targets = np.digitize(inputs[:, :3].sum(axis=1), np.linspace(-2, 2, classes - 1))
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", ConvergenceWarning)
+        neural_network = MLPClassifier(hidden_layer_sizes=(16, 8), activation=activation, max_iter=50, random_state=0)
+        neural_network.fit(inputs, targets)
+    return neural_network, rng.normal(size=(1000, 12))
+
+
+@pytest.mark.parametrize("activation", ["relu", "logistic", "tanh", "identity"])
+@pytest.mark.parametrize("classes", [2, 4])
+def test_float64_matches_sklearn_exactly(classes, activation):
+    neural_network, inputs = train_classifier(classes, activation)
+    engine = MlpInferenceEngine(neural_network)
+
+    assert np.array_equal(engine.predict(inputs), neural_network.predict(inputs))
+    probabilities = engine.predict_proba_raw(inputs)
+    expected = neural_network.predict_proba(inputs)
+    assert np.array_equal(probabilities, expected if classes > 2 else expected[:, 1:])
+
+
+def test_multilabel_matches_sklearn():
+    neural_network, inputs = train_classifier(2, "relu", multilabel=True)
+
+    assert np.array_equal(MlpInferenceEngine(neural_network).predict(inputs), neural_network.predict(inputs))
+
+
+def test_float32_within_tolerance():
+    neural_network, inputs = train_classifier(4, "relu")
+
+    probabilities = MlpInferenceEngine(neural_network, np.float32).predict_proba_raw(inputs)
+    assert probabilities.dtype == np.float32
+    np.testing.assert_allclose(probabilities, neural_network.predict_proba(inputs), rtol=0, atol=FLOAT32_TOLERANCE)
+
+
+def test_example_network_on_example_spectrum():
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", InconsistentVersionWarning)
+        neural_network = load(setting.DEFAULT_FILE_PATH_NEURAL_NETWORK)
+    _, gamma = SpectrumFile(setting.DEFAULT_FILE_PATH_WITH_SUBSTANCE, use_cache=False).get_data()
+    windows = sliding_windows((gamma - gamma.mean()) / gamma.std(), neural_network.n_features_in_)
+
+    assert np.array_equal(MlpInferenceEngine(neural_network).predict(windows), neural_network.predict(windows))
@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+from scipy.ndimage import uniform_filter1d
+from scipy.signal import butter, savgol_filter, sosfilt
+
+from detector_neural_network import setting
+from detector_neural_network.data_and_processing import (
+    prepare_spectrum_with_substance,
+    prepare_spectrum_without_substance,
+)
+from detector_neural_network.preprocessing import STAGE_NOISE, STAGE_RESAMPLE, run_pipeline
+from detector_neural_network.resampling import resample_uniform
+
+
+def prepare_with_substance_sequence(frequency, gamma) -> tuple[np.ndarray, np.ndarray, float]:
+    """Прежняя подготовка спектра с веществом: интерполяция, порог шума, сглаживание, повторная интерполяция."""
+    frequency, gamma = resample_uniform(frequency, gamma)
+    sos = butter(3, 0.1, btype="highpass", analog=False, output="sos")
+    smoothed_noise = np.std(uniform_filter1d(sosfilt(sos, gamma), size=3)) * 5
+    if setting.SAVGOL_FILTER_WINDOW_LENGTH != 0:
+        gamma = savgol_filter(gamma, window_length=setting.SAVGOL_FILTER_WINDOW_LENGTH, polyorder=2)
+    frequency, gamma = resample_uniform(frequency, gamma)
+    return frequency, gamma, smoothed_noise
+
+
+def prepare_without_substance_sequence(frequency, gamma) -> tuple[np.ndarray, np.ndarray]:
+    """Прежняя подготовка спектра без вещества: сглаживание и две интерполяции."""
+    if setting.SAVGOL_FILTER_WINDOW_LENGTH != 0:
+        gamma = savgol_filter(gamma, window_length=setting.SAVGOL_FILTER_WINDOW_LENGTH, polyorder=2)
+    return resample_uniform(*resample_uniform(frequency, gamma))
+
+
+def synthetic_spectrum(size: int = 5000) -> tuple[np.ndarray, np.ndarray]:
+    """Неравномерные частоты, линии поглощения на наклонной базовой линии и шум."""
+    rng = np.random.default_rng(0)
+    frequency = 22000 + np.cumsum(rng.uniform(0.05, 0.15, size))
+    lines = sum(1e-6 / (1 + ((frequency - center) / 0.3) ** 2) for center in rng.uniform(22050, 22700, 20))
+    gamma = 1e-7 * (frequency - 22000) / 700 + lines + rng.normal(scale=1e-8, size=size)
+    return frequency, gamma
+
+
+@pytest.fixture(params=[setting.SAVGOL_FILTER_WINDOW_LENGTH, 0], ids=["savgol", "no_savgol"])
+def savgol_window(request, monkeypatch):
+    monkeypatch.setattr(setting, "SAVGOL_FILTER_WINDOW_LENGTH", request.param)
+    return request.param
+
+
+def test_with_substance_matches_call_sequence(savgol_window):
+    frequency, gamma, smoothed_noise = prepare_spectrum_with_substance(*synthetic_spectrum())
+    expected_frequency, expected_gamma, expected_noise = prepare_with_substance_sequence(*synthetic_spectrum())
+
+    assert np.array_equal(frequency, expected_frequency)
+    assert np.array_equal(gamma, expected_gamma)
+    assert smoothed_noise == expected_noise
+
+
+def test_without_substance_matches_call_sequence(savgol_window):
+    frequency, gamma = prepare_spectrum_without_substance(*synthetic_spectrum())
+    expected_frequency, expected_gamma = prepare_without_substance_sequence(*synthetic_spectrum())
+
+    assert np.array_equal(frequency, expected_frequency)
+    assert np.array_equal(gamma, expected_gamma)
+
+
+def test_stages_without_noise_leave_threshold_empty():
+    assert run_pipeline(*synthetic_spectrum(), (STAGE_RESAMPLE,)).smoothed_noise is None
+
+
+def test_invalid_pipeline():
+    with pytest.raises(ValueError, match="повторяются"):
+        run_pipeline(*synthetic_spectrum(), (STAGE_RESAMPLE, STAGE_NOISE, STAGE_RESAMPLE))
+    with pytest.raises(KeyError):
+        run_pipeline(*synthetic_spectrum(), (STAGE_RESAMPLE, "unknown"))
+
+
+@pytest.mark.parametrize(("frequency", "gamma"), [([1.0, 2.0], [1.0]), ([], [])], ids=["length_mismatch", "empty"])
+def test_invalid_spectrum(frequency, gamma):
+    with pytest.raises(ValueError):
+        run_pipeline(frequency, gamma, (STAGE_RESAMPLE,))
@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+from scipy.interpolate import interp1d
+
+from detector_neural_network import setting
+from detector_neural_network.resampling import GRID_STEP, interpolate_linear, resample_uniform, uniform_grid_size
+from detector_neural_network.spectrum_reader import SpectrumFile
+
+
+def resample_with_interp1d(frequency, values, step: float = GRID_STEP) -> tuple[np.ndarray, np.ndarray]:
+    """Прежняя интерполяция на сетку (interpolate_values до перехода на np.interp)."""
+    frequency, values = np.asarray(frequency), np.asarray(values)
+    grid = np.arange(frequency.min(), frequency.max() + step, step)
+    return grid, interp1d(frequency, values, kind="linear", fill_value="extrapolate")(grid)
+
+
+def synthetic_spectrum(size: int = 20000) -> tuple[np.ndarray, np.ndarray]:
+    """Неравномерные частоты спектрометра и шумные значения."""
+    rng = np.random.default_rng(0)
+    return 22000 + np.cumsum(rng.uniform(0.05, 0.15, size)), rng.normal(size=size)
+
+
+@pytest.mark.parametrize(
+    "spectrum",
+    [
+        synthetic_spectrum(),
+        SpectrumFile(setting.DEFAULT_FILE_PATH_WITH_SUBSTANCE, use_cache=False).get_data(),
+        SpectrumFile(setting.DEFAULT_FILE_PATH_WITHOUT_SUBSTANCE, use_cache=False).get_data(),
+    ],
+    ids=["synthetic", "with_substance", "without_substance"],
+)
+def test_raw_spectrum_matches_interp1d_exactly(spectrum):
+    frequency, values = resample_uniform(*spectrum)
+    expected_frequency, expected_values = resample_with_interp1d(*spectrum)
+
+    assert np.array_equal(frequency, expected_frequency)
+    assert np.array_equal(values, expected_values)
+
+
+def test_unsorted_input_is_sorted():
+    frequency, values = synthetic_spectrum()
+    order = np.random.default_rng(1).permutation(len(frequency))
+
+    result = resample_uniform(frequency[order], values[order])
+    expected = resample_uniform(frequency, values)
+    assert np.array_equal(result[0], expected[0])
+    assert np.array_equal(result[1], expected[1])
+
+
+def test_grid_is_stable_under_repeated_resampling():
+    grid, values = resample_uniform(*synthetic_spectrum())
+
+    # np.arange добавил бы к уже полученной сетке лишний узел за последней частотой
+    repeated_grid, repeated_values = resample_uniform(grid, values)
+    assert np.array_equal(repeated_grid, grid)
+    assert np.array_equal(repeated_values, values)
+
+
+def test_uniform_grid_size_ignores_float_drift():
+    # (8 * 0.06 + 0.06) / 0.06 немного больше 9 - np.arange возвращает 10 узлов
+    assert len(np.arange(0, 8 * GRID_STEP + GRID_STEP, GRID_STEP)) == 10
+    assert uniform_grid_size(0, 8 * GRID_STEP) == 9
+    assert uniform_grid_size(0, 8.5 * GRID_STEP) == 10
+    assert uniform_grid_size(5.0, 5.0) == 1
+
+
+def test_extrapolation_matches_interp1d():
+    frequency = np.arange(10.0)
+    values = frequency**2
+    grid = np.linspace(-1, 12, 50)
+
+    expected = interp1d(frequency, values, kind="linear", fill_value="extrapolate")(grid)
+    assert np.array_equal(interpolate_linear(frequency, values, grid), expected)
+
+
+@pytest.mark.parametrize(
+    ("frequency", "values"),
+    [([1.0, 2.0], [1.0]), ([], []), ([1.0], [1.0])],
+    ids=["length_mismatch", "empty", "single_point"],
+)
+def test_invalid_input(frequency, values):
+    with pytest.raises(ValueError):
+        resample_uniform(frequency, values)